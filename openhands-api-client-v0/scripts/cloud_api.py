@@ -11,13 +11,116 @@ Key V0 endpoints:
 - /api/user/info - Get user information
 """
 
+import base64
+import json
+import logging
 import os
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Optional
 
+import httpx
 import requests
 
+try:
+    import orjson  # Optional: much faster JSON for large responses and trajectories
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # noqa: F401  Optional: HTTP/2 for httpx (pip install "httpx[http2]")
+
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# Compressed encodings httpx can decode here. br/zstd need the brotli /
+# zstandard packages, so only advertise them when installed.
+_ENCODINGS = ['br', 'gzip', 'deflate']
+try:
+    import brotli  # noqa: F401
+except ImportError:
+    _ENCODINGS.remove('br')
+try:
+    import zstandard  # noqa: F401
+
+    _ENCODINGS.insert(0, 'zstd')
+except ImportError:
+    pass
+
+logger = logging.getLogger('cloud_api')
+
+
+# Conversation details reused by get_conversation(use_cache=True)
+_CONVERSATION_TTL = 5.0  # seconds
+_CONVERSATION_CACHE_SIZE = 256
+# Settings, user info and per-conversation runtime lookups rarely change
+# during a script run (see _get_static)
+_STATIC_TTL = 60.0  # seconds
+_STATIC_CACHE_SIZE = 1024
+# Last ETag + payload per get_events query, for conditional re-fetches
+_ETAG_CACHE_SIZE = 512
+
+# Event window sizes tried in turn when scanning for a model / first user
+# message; wider windows are only fetched on a miss. The API caps limit at 100.
+_EVENT_WINDOWS = (5, 50, 100)
+
+# Where events carry the model name, checked in this order
+_TOP_MODEL_KEYS = ('model', 'llm_model', 'provider_model', 'selected_model')
+_META_MODEL_KEYS = ('model', 'llm_model', 'provider_model')
+_ARGS_MODEL_KEYS = ('model', 'llm_model')
+# Every top-level key any of the above lives under. Plain lookups beat a
+# generic path evaluator (e.g. jmespath) here, and keep the exact
+# isinstance(str) semantics.
+_MODEL_FIELDS = frozenset(
+    ('tool_call_metadata', 'metadata', 'meta', 'args', *_TOP_MODEL_KEYS)
+)
+
+
+def _cache_get(cache: dict[Any, tuple[float, Any]], key: Any, ttl: float) -> Any:
+    """Return the cached value for key if younger than ttl, else None."""
+    cached = cache.get(key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    return None
+
+
+def _cache_put(
+    cache: dict[Any, tuple[float, Any]], key: Any, value: Any, max_size: int
+) -> None:
+    """Store a fresh value, evicting the oldest entry when full."""
+    cache.pop(key, None)
+    if len(cache) >= max_size:
+        cache.pop(next(iter(cache)), None)
+    cache[key] = (time.monotonic(), value)
+
+
+def _page_offset(page_id: str) -> Optional[int]:
+    """Decode a V0 page id (a base64-encoded integer offset), or None."""
+    try:
+        return int(base64.b64decode(page_id, validate=True))
+    except ValueError:
+        return None
+
+
+def _next_page_ids(
+    page_id: Optional[str], step: Optional[int], count: int
+) -> list[str]:
+    """Guess the `count` page ids that follow page_id, `step` offsets apart.
+
+    Opaque page ids (or no step yet) yield no guesses, so callers fall back
+    to serial paging.
+    """
+    offset = _page_offset(page_id) if page_id and step else None
+    if offset is None:
+        return []
+    return [
+        base64.b64encode(str(offset + i * step).encode()).decode()
+        for i in range(1, count + 1)
+    ]
+
 
 class OpenHandsCloudAPI:
     """Client for interacting with OpenHands Cloud API (V0).
@@ -28,7 +131,7 @@ class OpenHandsCloudAPI:
     Attributes:
         api_key: The OpenHands API key
         base_url: Base URL for the OpenHands Cloud API
-        session: Requests session with auth headers configured
+        session: Pooled httpx client with auth headers configured
     """
 
     def __init__(
@@ -47,37 +150,107 @@ class OpenHandsCloudAPI:
             )
 
         self.base_url = os.getenv('OPENHANDS_APP_BASE', base_url).rstrip('/')
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json',
-            }
+        self._conv_url = f'{self.base_url}/api/conversations'
+        self._headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json',
+            'Accept-Encoding': ', '.join(_ENCODINGS),
+        }
+        # HTTP/2 (when h2 is installed) multiplexes concurrent calls, e.g. the
+        # list_conversations prefetch, over one connection.
+        self.session = httpx.Client(
+            http2=_HTTP2,
+            headers=self._headers,
+            timeout=httpx.Timeout(60.0),
+            follow_redirects=True,
         )
-
-    def list_conversations(self, limit: int = 100) -> list[dict[str, Any]]:
+        # Pooled client for direct runtime access. No default auth headers:
+        # the runtime fallbacks pass them per request (see _runtime_access).
+        self._runtime_session = httpx.Client(http2=_HTTP2, follow_redirects=True)
+        self._loads = orjson.loads if orjson is not None else json.loads
+        # conversation_id -> (fetched_at, details), oldest first
+        self._conv_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+        # API path -> (fetched_at, data), oldest first
+        self._static_cache: dict[str, tuple[float, Any]] = {}
+        # (conversation_id, *events params) -> (fetched_at, (etag, payload))
+        self._etags: dict[tuple, tuple[float, tuple[str, Any]]] = {}
+
+    def _post_json(self, url: str, payload: Any) -> httpx.Response:
+        """POST a JSON body, serialized with orjson when available.
+
+        The session already sends Content-Type: application/json.
+        """
+        if orjson is None:
+            return self.session.post(url, json=payload)
+        return self.session.post(url, content=orjson.dumps(payload))
+
+    def _get_static(self, path: str) -> Any:
+        """GET rarely-changing data, reusing results from the last minute."""
+        data = _cache_get(self._static_cache, path, _STATIC_TTL)
+        if data is None:
+            response = self.session.get(f'{self.base_url}{path}')
+            response.raise_for_status()
+            data = self._json(response)
+            _cache_put(self._static_cache, path, data, _STATIC_CACHE_SIZE)
+        return data
+
+    def _json(self, response: httpx.Response) -> Any:
+        """Decode a JSON response body from raw bytes (orjson when available)."""
+        return self._loads(response.content)
+
+    def _get_conversations_page(
+        self, limit: int, page_id: Optional[str]
+    ) -> dict[str, Any]:
+        """Fetch one page of the conversation list."""
+        params: dict[str, Any] = {'limit': limit}
+        if page_id:
+            params['page_id'] = page_id
+        r = self.session.get(self._conv_url, params=params)
+        r.raise_for_status()
+        return self._json(r)
+
+    def list_conversations(
+        self, limit: int = 100, prefetch: int = 8
+    ) -> list[dict[str, Any]]:
         """List conversations with pagination.
 
+        Once the first page reveals the page id format, the next `prefetch`
+        pages are requested concurrently. Each guessed page id is checked
+        against the next_page_id actually returned, so results are the same
+        as walking pages one by one; a few pages past the end may be fetched
+        and discarded.
+
         Args:
             limit: Page size (max 100)
+            prefetch: Pages to request at once (1 = strictly serial)
 
         Returns:
             Flattened list of conversation summaries
         """
         results: list[dict[str, Any]] = []
         page_id: str | None = None
-        while True:
-            params: dict[str, Any] = {'limit': limit}
-            if page_id:
-                params['page_id'] = page_id
-            r = self.session.get(f'{self.base_url}/api/conversations', params=params)
-            r.raise_for_status()
-            data = r.json()
-            results.extend(data.get('results', []))
-            page_id = data.get('next_page_id')
-            if not page_id:
-                break
-        return results
+        step: int | None = None  # Offset between pages, learned from page 1
+        with ThreadPoolExecutor(max_workers=max(1, prefetch)) as pool:
+            while True:
+                window = [page_id, *_next_page_ids(page_id, step, prefetch - 1)]
+                futures = [
+                    pool.submit(self._get_conversations_page, limit, pid)
+                    for pid in window
+                ]
+                try:
+                    for i, future in enumerate(futures):
+                        data = future.result()
+                        results.extend(data.get('results', []))
+                        page_id = data.get('next_page_id')
+                        if not page_id:
+                            return results
+                        if step is None:
+                            step = _page_offset(page_id)  # First page is offset 0
+                        if i + 1 < len(window) and window[i + 1] != page_id:
+                            break  # Guess was wrong, restart from the real page id
+                finally:
+                    for future in futures:
+                        future.cancel()
 
     def get_last_event_id(self, conversation_id: str) -> int | None:
         """Return the latest event id using a minimal query."""
@@ -87,13 +260,40 @@ class OpenHandsCloudAPI:
 
     def get_recent_model(self, conversation_id: str) -> str | None:
         """Inspect a small recent window for model metadata and return first found."""
-        payload = self.get_events(conversation_id, reverse=True, limit=20)
-        return self._get_model_from_events(payload.get('events', []))
+        model, _ = self._scan_events(
+            conversation_id, self._get_model_from_events, reverse=True
+        )
+        return model
 
     def get_first_user_message(self, conversation_id: str) -> str | None:
         """Fetch earliest handful of events and return the first user message text if present."""
-        payload = self.get_events(conversation_id, start_id=0, limit=20)
-        for e in payload.get('events', []):
+        message, _ = self._scan_events(
+            conversation_id, self._get_first_user_message_from_events, start_id=0
+        )
+        return message
+
+    def _scan_events(
+        self, conversation_id: str, find: Any, **query: Any
+    ) -> tuple[Any, list[dict[str, Any]]]:
+        """Apply find() to growing event windows (_EVENT_WINDOWS) until it hits.
+
+        Stops early once a window comes back short, i.e. there are no more
+        events. Returns what find() returned and the last window's events.
+        """
+        for limit in _EVENT_WINDOWS:
+            events = self.get_events(conversation_id, limit=limit, **query).get(
+                'events', []
+            )
+            found = find(events)
+            if found is not None or len(events) < limit:
+                break
+        return found, events
+
+    def _get_first_user_message_from_events(
+        self, events: list[dict[str, Any]]
+    ) -> str | None:
+        """Return the first non-empty user message text in events."""
+        for e in events:
             if e.get('source') == 'user':
                 # Try 'message' then 'content'
                 msg = e.get('message') or e.get('content')
@@ -103,30 +303,41 @@ class OpenHandsCloudAPI:
 
     def get_early_model(self, conversation_id: str) -> str | None:
         """Inspect the earliest small window for the first model reference."""
-        payload = self.get_events(conversation_id, start_id=0, limit=20)
-        return self._get_model_from_events(payload.get('events', []))
+        model, _ = self._scan_events(
+            conversation_id, self._get_model_from_events, start_id=0
+        )
+        return model
 
 
     def _get_model_from_events(self, events: list[dict[str, Any]]) -> str | None:
         """Extract model name from a list of events, checking common locations."""
         for e in events:
-            m = ((e.get('tool_call_metadata') or {}).get('model_response') or {}).get('model')
-            if isinstance(m, str):
-                return m
-            for k in ('model', 'llm_model', 'provider_model', 'selected_model'):
+            # Observations etc. carry none of the fields: one set check, no lookups
+            if _MODEL_FIELDS.isdisjoint(e):
+                continue
+            # Most events lack these sub-dicts, so skip them instead of
+            # probing empty placeholders
+            tool_meta = e.get('tool_call_metadata')
+            if tool_meta:
+                m = (tool_meta.get('model_response') or {}).get('model')
+                if isinstance(m, str):
+                    return m
+            for k in _TOP_MODEL_KEYS:
                 v = e.get(k)
                 if isinstance(v, str):
                     return v
-            meta = e.get('metadata') or e.get('meta') or {}
-            for k in ('model', 'llm_model', 'provider_model'):
-                v = meta.get(k)
-                if isinstance(v, str):
-                    return v
-            args = e.get('args') or {}
-            for k in ('model', 'llm_model'):
-                v = args.get(k)
-                if isinstance(v, str):
-                    return v
+            meta = e.get('metadata') or e.get('meta')
+            if meta:
+                for k in _META_MODEL_KEYS:
+                    v = meta.get(k)
+                    if isinstance(v, str):
+                        return v
+            args = e.get('args')
+            if args:
+                for k in _ARGS_MODEL_KEYS:
+                    v = args.get(k)
+                    if isinstance(v, str):
+                        return v
         return None
 
     def store_llm_settings(
@@ -152,11 +363,10 @@ class OpenHandsCloudAPI:
         if llm_api_key:
             settings_data['llm_api_key'] = llm_api_key
 
-        response = self.session.post(
-            f'{self.base_url}/api/settings', json=settings_data
-        )
+        self._static_cache.pop('/api/settings', None)
+        response = self._post_json(f'{self.base_url}/api/settings', settings_data)
         response.raise_for_status()
-        return response.json()
+        return self._json(response)
 
     def create_conversation(
         self,
@@ -181,11 +391,9 @@ class OpenHandsCloudAPI:
         if selected_branch:
             conversation_data['selected_branch'] = selected_branch
 
-        response = self.session.post(
-            f'{self.base_url}/api/conversations', json=conversation_data
-        )
+        response = self._post_json(self._conv_url, conversation_data)
         response.raise_for_status()
-        return response.json()
+        return self._json(response)
 
     def create_conversation_from_files(
         self,
@@ -202,31 +410,52 @@ class OpenHandsCloudAPI:
             append_common_tail: If True, append the common tail file contents
             common_tail_path: Path to the common tail file
         """
-        main_text = Path(main_prompt_path).read_text()
-        if append_common_tail and Path(common_tail_path).exists():
-            tail = Path(common_tail_path).read_text()
-            initial_user_msg = f'{main_text}\n\n{tail}'
-        else:
-            initial_user_msg = main_text
+        # Join as bytes and decode once; a missing tail file is skipped
+        body = Path(main_prompt_path).read_bytes()
+        if append_common_tail:
+            try:
+                body += b'\n\n' + Path(common_tail_path).read_bytes()
+            except FileNotFoundError:
+                pass
+        initial_user_msg = body.decode('utf-8')
         return self.create_conversation(
             initial_user_msg=initial_user_msg,
             repository=repository,
         )
 
-    def get_conversation(self, conversation_id: str) -> dict[str, Any]:
+    def get_conversation(
+        self, conversation_id: str, use_cache: bool = False
+    ) -> dict[str, Any]:
         """Get conversation status and details.
 
         Args:
             conversation_id: The conversation ID
+            use_cache: Reuse details fetched in the last few seconds instead
+                of making a request. Every fetch refreshes the cache.
 
         Returns:
-            Conversation details including status
+            Conversation details including status (treat cached results as read-only)
         """
+        if use_cache:
+            cached = _cache_get(self._conv_cache, conversation_id, _CONVERSATION_TTL)
+            if cached is not None:
+                return cached
         response = self.session.get(
-            f'{self.base_url}/api/conversations/{conversation_id}'
+            f'{self._conv_url}/{conversation_id}'
         )
         response.raise_for_status()
-        return response.json()
+        details = self._json(response)
+        _cache_put(
+            self._conv_cache, conversation_id, details, _CONVERSATION_CACHE_SIZE
+        )
+        return details
+
+    def invalidate_conversation(self, conversation_id: str) -> None:
+        """Drop cached details, e.g. after a call that changes the conversation."""
+        self._conv_cache.pop(conversation_id, None)
+        prefix = f'/api/conversations/{conversation_id}/'
+        for path in [p for p in self._static_cache if p.startswith(prefix)]:
+            del self._static_cache[path]
 
     def get_trajectory(self, conversation_id: str) -> dict[str, Any]:
         """Get the trajectory (event history) for a conversation.
@@ -238,10 +467,17 @@ class OpenHandsCloudAPI:
             Trajectory data with events
         """
         response = self.session.get(
-            f'{self.base_url}/api/conversations/{conversation_id}/trajectory'
+            f'{self._conv_url}/{conversation_id}/trajectory'
         )
         response.raise_for_status()
-        return response.json()
+        logger.debug(
+            'trajectory %s: Content-Encoding=%s, %d bytes on the wire, %d decoded',
+            conversation_id,
+            response.headers.get('Content-Encoding', 'identity'),
+            response.num_bytes_downloaded,
+            len(response.content),
+        )
+        return self._json(response)
 
     def get_events(
         self,
@@ -275,7 +511,37 @@ class OpenHandsCloudAPI:
             condensations = [e for e in events['events']
                            if e.get('source') == 'agent' and
                               e.get('action') == 'condensation']
+
+        Repeated identical queries (e.g. polling for the latest event) send
+        If-None-Match, so an unchanged page comes back as a bodiless 304 and
+        the previous payload is reused (treat it as read-only).
         """
+        params = self._events_params(start_id, end_id, reverse, limit)
+        key = (conversation_id, *params.values())
+        cached = self._etags.get(key)
+        headers = {'If-None-Match': cached[1][0]} if cached else None
+        response = self.session.get(
+            f'{self._conv_url}/{conversation_id}/events',
+            params=params,
+            headers=headers,
+        )
+        if cached and response.status_code == 304:
+            return cached[1][1]
+        response.raise_for_status()
+        data = self._json(response)
+        etag = response.headers.get('ETag')
+        if etag:
+            _cache_put(self._etags, key, (etag, data), _ETAG_CACHE_SIZE)
+        return data
+
+    def _events_params(
+        self,
+        start_id: int = 0,
+        end_id: Optional[int] = None,
+        reverse: bool = False,
+        limit: int = 20,
+    ) -> dict[str, Any]:
+        """Build query params for the events endpoint."""
         # Clamp limit to [1, 100]
         limit = max(1, min(100, int(limit)))
         params = {
@@ -285,28 +551,32 @@ class OpenHandsCloudAPI:
         }
         if end_id is not None:
             params['end_id'] = end_id
-
-        response = self.session.get(
-            f'{self.base_url}/api/conversations/{conversation_id}/events',
-            params=params,
-        )
-        response.raise_for_status()
-        return response.json()
+        return params
 
     def poll_until_stopped(
-        self, conversation_id: str, timeout: int = 1200, poll_interval: int = 300
+        self,
+        conversation_id: str,
+        timeout: int = 1200,
+        poll_interval: int = 300,
+        min_interval: float = 2.0,
     ) -> dict[str, Any]:
         """Poll conversation until it stops or times out.
 
+        The wait between polls starts at min_interval and grows 1.5x per
+        poll up to poll_interval, with +/-20% jitter, so quick conversations
+        are noticed within seconds while long ones are polled sparingly.
+
         Args:
             conversation_id: The conversation ID
             timeout: Maximum time to wait in seconds (default: 20 minutes)
-            poll_interval: Time between polls in seconds (default: 5 minutes)
+            poll_interval: Longest time between polls in seconds (default: 5 minutes)
+            min_interval: First wait between polls in seconds (default: 2)
 
         Returns:
             Final conversation status
         """
         start_time = time.time()
+        attempt = 0
 
         while time.time() - start_time < timeout:
             try:
@@ -321,10 +591,15 @@ class OpenHandsCloudAPI:
                     print(f'⚠️  Conversation ended with status: {status}')
                     return conversation
 
+                delay = min(poll_interval, min_interval * 1.5**attempt)
+                delay *= 0.8 + 0.4 * random.random()
+                # Don't sleep past the deadline
+                delay = max(0.0, min(delay, timeout - (time.time() - start_time)))
+                attempt += 1
                 print(
-                    f'Conversation {conversation_id} status: {status}. Waiting {poll_interval}s...'
+                    f'Conversation {conversation_id} status: {status}. Waiting {delay:.0f}s...'
                 )
-                time.sleep(poll_interval)
+                time.sleep(delay)
 
             except Exception as e:
                 print(f'Error polling conversation {conversation_id}: {e}')
@@ -368,9 +643,7 @@ class OpenHandsCloudAPI:
             Settings object with LLM configuration and preferences.
             Note: API keys are masked (only shows if they're set, not values)
         """
-        response = self.session.get(f'{self.base_url}/api/settings')
-        response.raise_for_status()
-        return response.json()
+        return self._get_static('/api/settings')
 
     def get_user_info(self) -> dict[str, Any]:
         """Get information about the authenticated user.
@@ -378,9 +651,7 @@ class OpenHandsCloudAPI:
         Returns:
             User info including name, email, and linked git providers
         """
-        response = self.session.get(f'{self.base_url}/api/user/info')
-        response.raise_for_status()
-        return response.json()
+        return self._get_static('/api/user/info')
 
     def delete_conversation(self, conversation_id: str) -> dict[str, Any]:
         """Delete a conversation.
@@ -391,11 +662,12 @@ class OpenHandsCloudAPI:
         Returns:
             Confirmation response
         """
+        self.invalidate_conversation(conversation_id)
         response = self.session.delete(
-            f'{self.base_url}/api/conversations/{conversation_id}'
+            f'{self._conv_url}/{conversation_id}'
         )
         response.raise_for_status()
-        return response.json()
+        return self._json(response)
 
     def start_conversation(
         self,
@@ -417,12 +689,12 @@ class OpenHandsCloudAPI:
         else:
             payload['providers_set'] = {}
 
-        response = self.session.post(
-            f'{self.base_url}/api/conversations/{conversation_id}/start',
-            json=payload,
+        self.invalidate_conversation(conversation_id)
+        response = self._post_json(
+            f'{self._conv_url}/{conversation_id}/start', payload
         )
         response.raise_for_status()
-        return response.json()
+        return self._json(response)
 
     def stop_conversation(self, conversation_id: str) -> dict[str, Any]:
         """Stop a running conversation.
@@ -433,11 +705,12 @@ class OpenHandsCloudAPI:
         Returns:
             Confirmation response
         """
+        self.invalidate_conversation(conversation_id)
         response = self.session.post(
-            f'{self.base_url}/api/conversations/{conversation_id}/stop'
+            f'{self._conv_url}/{conversation_id}/stop'
         )
         response.raise_for_status()
-        return response.json()
+        return self._json(response)
 
     def send_message(self, conversation_id: str, message: str) -> dict[str, Any]:
         """Send a message to an existing conversation.
@@ -449,12 +722,12 @@ class OpenHandsCloudAPI:
         Returns:
             Confirmation response
         """
-        response = self.session.post(
-            f'{self.base_url}/api/conversations/{conversation_id}/message',
-            json={'message': message},
+        self.invalidate_conversation(conversation_id)
+        response = self._post_json(
+            f'{self._conv_url}/{conversation_id}/message', {'message': message}
         )
         response.raise_for_status()
-        return response.json()
+        return self._json(response)
 
     def list_files(
         self, conversation_id: str, path: Optional[str] = None
@@ -473,11 +746,11 @@ class OpenHandsCloudAPI:
             params['path'] = path
 
         response = self.session.get(
-            f'{self.base_url}/api/conversations/{conversation_id}/list-files',
+            f'{self._conv_url}/{conversation_id}/list-files',
             params=params,
         )
         response.raise_for_status()
-        return response.json()
+        return self._json(response)
 
     def get_runtime_config(self, conversation_id: str) -> dict[str, Any]:
         """Get runtime configuration for a conversation.
@@ -491,11 +764,7 @@ class OpenHandsCloudAPI:
         Returns:
             Dict with 'runtime_id' and 'session_id' keys
         """
-        response = self.session.get(
-            f'{self.base_url}/api/conversations/{conversation_id}/config'
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._get_static(f'/api/conversations/{conversation_id}/config')
 
     def get_vscode_url(self, conversation_id: str) -> Optional[str]:
         """Get VS Code URL for a conversation (deprecated in V1).
@@ -506,11 +775,7 @@ class OpenHandsCloudAPI:
         Returns:
             VS Code URL or None if not available
         """
-        response = self.session.get(
-            f'{self.base_url}/api/conversations/{conversation_id}/vscode-url'
-        )
-        response.raise_for_status()
-        data = response.json()
+        data = self._get_static(f'/api/conversations/{conversation_id}/vscode-url')
         return data.get('vscode_url')
 
     def get_web_hosts(self, conversation_id: str) -> Optional[list[str]]:
@@ -522,11 +787,7 @@ class OpenHandsCloudAPI:
         Returns:
             List of host URLs or None if not available
         """
-        response = self.session.get(
-            f'{self.base_url}/api/conversations/{conversation_id}/web-hosts'
-        )
-        response.raise_for_status()
-        data = response.json()
+        data = self._get_static(f'/api/conversations/{conversation_id}/web-hosts')
         return data.get('hosts')
 
     def get_microagents(self, conversation_id: str) -> list[dict[str, Any]]:
@@ -538,11 +799,7 @@ class OpenHandsCloudAPI:
         Returns:
             List of microagent objects with name, type, content, triggers
         """
-        response = self.session.get(
-            f'{self.base_url}/api/conversations/{conversation_id}/microagents'
-        )
-        response.raise_for_status()
-        data = response.json()
+        data = self._get_static(f'/api/conversations/{conversation_id}/microagents')
         return data.get('microagents', [])
 
     def submit_feedback(
@@ -570,17 +827,38 @@ class OpenHandsCloudAPI:
         if event_id is not None:
             payload['event_id'] = event_id
 
-        response = self.session.post(
-            f'{self.base_url}/api/conversations/{conversation_id}/submit-feedback',
-            json=payload,
+        response = self._post_json(
+            f'{self._conv_url}/{conversation_id}/submit-feedback', payload
         )
         response.raise_for_status()
-        return response.json()
+        return self._json(response)
 
     # =========================================================================
     # Runtime Fallback Support
     # =========================================================================
 
+    def _runtime_access(self, conversation_id: str) -> tuple[str, dict[str, str]]:
+        """Return the runtime URL and auth headers for direct runtime access.
+
+        Raises:
+            ValueError: If runtime URL or session key not available
+        """
+        details = self.get_conversation(conversation_id, use_cache=True)
+        runtime_url = details.get('url')
+        session_key = details.get('session_api_key')
+
+        if not runtime_url or not session_key:
+            raise ValueError(
+                'Runtime URL or session key not available. '
+                'Conversation may be stopped or archived.'
+            )
+
+        headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'X-Session-API-Key': session_key,
+        }
+        return runtime_url, headers
+
     def get_trajectory_via_runtime(
         self,
         conversation_id: str,
@@ -601,27 +879,14 @@ class OpenHandsCloudAPI:
         Raises:
             ValueError: If runtime URL or session key not available
         """
-        details = self.get_conversation(conversation_id)
-        runtime_url = details.get('url')
-        session_key = details.get('session_api_key')
-
-        if not runtime_url or not session_key:
-            raise ValueError(
-                'Runtime URL or session key not available. '
-                'Conversation may be stopped or archived.'
-            )
-
-        headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'X-Session-API-Key': session_key,
-        }
-        response = requests.get(
+        runtime_url, headers = self._runtime_access(conversation_id)
+        response = self._runtime_session.get(
             f'{runtime_url}/trajectory',
             headers=headers,
             timeout=timeout,
         )
         response.raise_for_status()
-        return response.json()
+        return self._json(response)
 
     def get_events_via_runtime(
         self,
@@ -646,34 +911,21 @@ class OpenHandsCloudAPI:
         Raises:
             ValueError: If runtime URL or session key not available
         """
-        details = self.get_conversation(conversation_id)
-        runtime_url = details.get('url')
-        session_key = details.get('session_api_key')
-
-        if not runtime_url or not session_key:
-            raise ValueError(
-                'Runtime URL or session key not available. '
-                'Conversation may be stopped or archived.'
-            )
-
+        runtime_url, headers = self._runtime_access(conversation_id)
         limit = max(1, min(100, int(limit)))
-        headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'X-Session-API-Key': session_key,
-        }
         params = {
             'start_id': start_id,
             'limit': limit,
             'reverse': str(reverse).lower(),
         }
-        response = requests.get(
+        response = self._runtime_session.get(
             f'{runtime_url}/events',
             headers=headers,
             params=params,
             timeout=timeout,
         )
         response.raise_for_status()
-        return response.json()
+        return self._json(response)
 
     # =========================================================================
     # Utility Methods
@@ -684,6 +936,7 @@ class OpenHandsCloudAPI:
         conversation_id: str,
         output_path: Optional[str] = None,
         use_runtime_fallback: bool = False,
+        as_raw: bool = False,
     ) -> str:
         """Download trajectory and save to a JSON file.
 
@@ -691,39 +944,134 @@ class OpenHandsCloudAPI:
             conversation_id: The conversation ID
             output_path: Output file path (default: trajectory_{id}.json)
             use_runtime_fallback: If True, use runtime URL instead of main API
+            as_raw: If True, stream the response bytes straight to disk as
+                sent by the server (not re-indented). Memory stays flat and
+                the parse/serialize round trip is skipped; best for large
+                trajectories.
 
         Returns:
             Path to the saved file
         """
-        import json
-
         if output_path is None:
             output_path = f'trajectory_{conversation_id}.json'
 
+        if as_raw:
+            self._stream_trajectory_to_file(
+                conversation_id, output_path, use_runtime_fallback
+            )
+            return output_path
+
         if use_runtime_fallback:
             trajectory = self.get_trajectory_via_runtime(conversation_id)
         else:
             trajectory = self.get_trajectory(conversation_id)
 
-        with open(output_path, 'w') as f:
-            json.dump(trajectory, f, indent=2, default=str)
+        if orjson is not None:
+            # No default= callback on the fast path; API data is plain JSON
+            option = orjson.OPT_INDENT_2
+            try:
+                body = orjson.dumps(trajectory, option=option)
+            except TypeError:  # orjson.JSONEncodeError: an unsupported type
+                body = orjson.dumps(trajectory, default=str, option=option)
+            Path(output_path).write_bytes(body)
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(trajectory, f, indent=2, default=str, ensure_ascii=False)
 
         return output_path
 
+    def _stream_trajectory_to_file(
+        self,
+        conversation_id: str,
+        output_path: str,
+        use_runtime_fallback: bool,
+        chunk_size: int = 64 * 1024,
+    ) -> None:
+        """Write the trajectory response body to output_path chunk by chunk."""
+        if use_runtime_fallback:
+            runtime_url, headers = self._runtime_access(conversation_id)
+            client, url = self._runtime_session, f'{runtime_url}/trajectory'
+            timeout = 300
+        else:
+            client, headers = self.session, None
+            url, timeout = f'{self._conv_url}/{conversation_id}/trajectory', 60
+
+        with client.stream('GET', url, headers=headers, timeout=timeout) as response:
+            if response.is_error:
+                response.read()  # So the raised error carries the body
+            response.raise_for_status()
+            with open(output_path, 'wb') as f:
+                for chunk in response.iter_bytes(chunk_size):
+                    f.write(chunk)
+
     def get_conversation_summary(self, conversation_id: str) -> dict[str, Any]:
         """Get a summary of conversation state and statistics.
 
+        The three lookups are independent, so they run concurrently on a
+        small thread pool over the pooled session.
+
         Args:
             conversation_id: The conversation ID
 
         Returns:
             Dict with title, status, event count, model used, etc.
         """
-        details = self.get_conversation(conversation_id)
-        last_event_id = self.get_last_event_id(conversation_id)
-        model = self.get_recent_model(conversation_id)
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            details = pool.submit(self.get_conversation, conversation_id, use_cache=True)
+            # The recent window scanned for the model also gives the latest event id
+            recent = pool.submit(
+                self._scan_events, conversation_id, self._get_model_from_events, reverse=True
+            )
+            first_msg = pool.submit(self.get_first_user_message, conversation_id)
+            model, recent_events = recent.result()
+            return self._build_summary(
+                conversation_id, details.result(), recent_events, model, first_msg.result()
+            )
+
+    def get_conversation_summaries(
+        self, conversation_ids: list[str], max_workers: int = 16
+    ) -> list[dict[str, Any]]:
+        """Summarize many conversations concurrently.
+
+        Conversations are spread over a thread pool that shares the pooled
+        session, so workers reuse keep-alive connections.
+
+        Args:
+            conversation_ids: The conversation IDs
+            max_workers: Conversations summarized at once
+
+        Returns:
+            Summaries in the same order as conversation_ids
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(
+                pool.map(self._get_conversation_summary_serial, conversation_ids)
+            )
+
+    def _get_conversation_summary_serial(self, conversation_id: str) -> dict[str, Any]:
+        """get_conversation_summary over the sync session, one request at a time."""
+        details = self.get_conversation(conversation_id, use_cache=True)
+        # The recent window scanned for the model also gives the latest event id
+        model, recent = self._scan_events(
+            conversation_id, self._get_model_from_events, reverse=True
+        )
         first_msg = self.get_first_user_message(conversation_id)
+        return self._build_summary(conversation_id, details, recent, model, first_msg)
 
+    def _build_summary(
+        self,
+        conversation_id: str,
+        details: dict[str, Any],
+        recent_events: list[dict[str, Any]],
+        model: str | None,
+        first_msg: str | None,
+    ) -> dict[str, Any]:
+        """Assemble the get_conversation_summary result.
+
+        recent_events is a reverse-ordered window, so its first event is the
+        latest one.
+        """
+        last_event_id = recent_events[0]['id'] if recent_events else None
         return {
             'conversation_id': conversation_id,
             'title': details.get('title'),
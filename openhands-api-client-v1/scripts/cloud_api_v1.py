@@ -6,17 +6,96 @@ SAFETY: This script is designed to make minimal API calls.
 - Use limit=1 for list operations during testing
 - No loops that hit the API
 - Each function makes at most ONE API call
+- Batch helpers (fetch_many_counts) make ONE call per ID, run concurrently
+- GETs that hit a transient 429/502/503/504 are retried with backoff
+  (at most 5 attempts); POSTs are never retried on status
+- 401/403/404/429 return {"_error": status, "_body": text} (see is_error());
+  other HTTP errors raise httpx.HTTPStatusError
 """
 
+import asyncio
+import atexit
+import contextlib
+import functools
+import hashlib
 import os
 import json
+import logging
+import random
+import sys
+import time
 import httpx
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+try:
+    import orjson  # Optional: faster JSON decode/encode
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # noqa: F401  Optional: enables HTTP/2 (pip install "httpx[http2]")
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# Compressed response encodings we can decode. httpx decodes br/zstd only when
+# these packages are installed (pip install brotli zstandard), so only
+# advertise what will actually be understood.
+_ENCODINGS = ["gzip", "deflate"]
+try:
+    import brotli  # noqa: F401
+    _ENCODINGS.append("br")
+except ImportError:
+    pass
+try:
+    import zstandard  # noqa: F401
+    _ENCODINGS.append("zstd")
+except ImportError:
+    pass
+_ACCEPT_ENCODING = ", ".join(_ENCODINGS)
+
+try:
+    import hishel  # Optional: disk cache for GETs, see OPENHANDS_CACHE_TTL
+except ImportError:
+    hishel = None
+
+logger = logging.getLogger("cloud_api_v1")
 
 # Configuration
 API_KEY = os.environ.get("OPENHANDS_API_KEY")
 BASE_URL = os.environ.get("OPENHANDS_APP_BASE", "https://app.all-hands.dev")
 API_V1_URL = f"{BASE_URL}/api/v1"
+# Opt-in disk cache for App Server GETs, in seconds (0 = off)
+CACHE_TTL = float(os.environ.get("OPENHANDS_CACHE_TTL") or 0)
+CACHE_DIR = os.environ.get("OPENHANDS_CACHE_DIR", ".cache/openhands")
+
+# Endpoint paths, relative to the client's base_url (API_V1_URL for the App
+# Server, the sandbox URL for Agent Servers). {} slots take IDs / file paths.
+_URLS = {
+    # App Server
+    "app_convs": "/app-conversations",
+    "app_conv_search": "/app-conversations/search",
+    "app_conv_count": "/app-conversations/count",
+    "app_conv_download": "/app-conversations/{}/download",
+    "start_tasks": "/app-conversations/start-tasks",
+    "sandbox_search": "/sandboxes/search",
+    "sandbox_resume": "/sandboxes/{}/resume",
+    "sandbox_pause": "/sandboxes/{}/pause",
+    "sandbox_spec_search": "/sandbox-specs/search",
+    "events_search": "/conversation/{}/events/search",
+    "events_count": "/conversation/{}/events/count",
+    "users_me": "/users/me",
+    # Agent Server
+    "agent_events_search": "/api/conversations/{}/events/search",
+    "agent_events_count": "/api/conversations/{}/events/count",
+    "agent_bash": "/api/bash/execute_bash_command",
+    "agent_file_download": "/api/file/download{}",
+    "agent_file_upload": "/api/file/upload{}",
+}
 
 def get_headers():
     """Get headers for API requests."""
@@ -25,15 +104,311 @@ def get_headers():
     return {
         "Authorization": f"Bearer {API_KEY}",
         "Content-Type": "application/json",
+        "Accept-Encoding": _ACCEPT_ENCODING,
     }
 
+# =============================================================================
+# Shared HTTP clients
+# Reused across calls so keep-alive connections skip the TCP+TLS handshake.
+# With HTTP/2, concurrent requests (e.g. gather_reads) are multiplexed over one
+# connection; each request has its own stream, so responses never get mixed up.
+# =============================================================================
+
+_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+_CLIENT: httpx.Client | None = None
+_AGENT_CLIENTS: dict[str, httpx.Client] = {}
+
+# Per-request opt-out for GETs whose answer changes while you poll them
+_NO_CACHE = {"cache_disabled": True}
+
+def _check_cache_available():
+    if hishel is None:
+        raise ValueError("OPENHANDS_CACHE_TTL is set but hishel is not installed (pip install hishel)")
+
+# Credential headers folded into the cache key, so switching API keys never
+# serves another account's cached responses.
+_CACHE_KEY_HEADERS = (b"authorization", b"x-session-api-key")
+
+def _cache_key(request, body: bytes = b"") -> str:
+    """hishel's default key (method + URL + body) plus a hash of the credentials."""
+    h = hashlib.sha256(hishel._utils.generate_key(request, body).encode())
+    for name, value in request.headers:
+        if name.lower() in _CACHE_KEY_HEADERS:
+            h.update(name.lower() + b":" + value + b"\n")
+    return h.hexdigest()
+
+def _cache_controller():
+    # The API sends no Cache-Control headers, so cache GETs for CACHE_TTL regardless.
+    # POSTs are never cached (hishel only caches GET by default).
+    return hishel.Controller(force_cache=True, key_generator=_cache_key)
+
+# Failed connects are retried by the transport; they never reached the server,
+# so this is safe for POSTs too. Retries on HTTP status happen in _request().
+_CONNECT_RETRIES = 3
+
+def _transport(cache: bool = False) -> httpx.BaseTransport:
+    """Pooled transport, wrapped in a disk cache if cache and OPENHANDS_CACHE_TTL."""
+    transport = httpx.HTTPTransport(limits=_LIMITS, http2=_HTTP2, retries=_CONNECT_RETRIES)
+    if not (cache and CACHE_TTL):
+        return transport
+    _check_cache_available()
+    return hishel.CacheTransport(
+        transport=transport,
+        storage=hishel.FileStorage(base_path=Path(CACHE_DIR), ttl=CACHE_TTL),
+        controller=_cache_controller(),
+    )
+
+def _async_transport(cache: bool = False) -> httpx.AsyncBaseTransport:
+    """Async counterpart of _transport."""
+    transport = httpx.AsyncHTTPTransport(limits=_LIMITS, http2=_HTTP2, retries=_CONNECT_RETRIES)
+    if not (cache and CACHE_TTL):
+        return transport
+    _check_cache_available()
+    return hishel.AsyncCacheTransport(
+        transport=transport,
+        storage=hishel.AsyncFileStorage(base_path=Path(CACHE_DIR), ttl=CACHE_TTL),
+        controller=_cache_controller(),
+    )
+
+def _get_client() -> httpx.Client:
+    """Get the shared App Server client, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.Client(
+            base_url=API_V1_URL, headers=get_headers(), timeout=30, transport=_transport(cache=True)
+        )
+    return _CLIENT
+
+def _get_agent_client(agent_server_url: str) -> httpx.Client:
+    """Get the shared client for an Agent Server, creating it on first use.
+
+    Kept separate from the App Server client so the OpenHands API key is
+    never sent to a sandbox. Auth headers are passed per request.
+    """
+    client = _AGENT_CLIENTS.get(agent_server_url)
+    if client is None:
+        client = httpx.Client(
+            base_url=agent_server_url,
+            headers={"Accept-Encoding": _ACCEPT_ENCODING},
+            timeout=30,
+            transport=_transport(),
+        )
+        _AGENT_CLIENTS[agent_server_url] = client
+    return client
+
+def close_clients():
+    """Close all shared HTTP clients."""
+    global _CLIENT
+    if _CLIENT is not None:
+        _CLIENT.close()
+        _CLIENT = None
+    for client in _AGENT_CLIENTS.values():
+        client.close()
+    _AGENT_CLIENTS.clear()
+
+atexit.register(close_clients)
+
+# Async clients are bound to the event loop they were first used in, so
+# run_async() closes them before its loop goes away.
+_ASYNC_CLIENT: httpx.AsyncClient | None = None
+_ASYNC_AGENT_CLIENTS: dict[str, httpx.AsyncClient] = {}
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Get the shared async App Server client, creating it on first use."""
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None:
+        _ASYNC_CLIENT = httpx.AsyncClient(
+            base_url=API_V1_URL, headers=get_headers(), timeout=30, transport=_async_transport(cache=True)
+        )
+    return _ASYNC_CLIENT
+
+def _get_async_agent_client(agent_server_url: str) -> httpx.AsyncClient:
+    """Get the shared async client for an Agent Server, creating it on first use."""
+    client = _ASYNC_AGENT_CLIENTS.get(agent_server_url)
+    if client is None:
+        client = httpx.AsyncClient(
+            base_url=agent_server_url,
+            headers={"Accept-Encoding": _ACCEPT_ENCODING},
+            timeout=30,
+            transport=_async_transport(),
+        )
+        _ASYNC_AGENT_CLIENTS[agent_server_url] = client
+    return client
+
+async def aclose_clients():
+    """Close all shared async HTTP clients."""
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is not None:
+        await _ASYNC_CLIENT.aclose()
+        _ASYNC_CLIENT = None
+    for client in _ASYNC_AGENT_CLIENTS.values():
+        await client.aclose()
+    _ASYNC_AGENT_CLIENTS.clear()
+
+def run_async(coro):
+    """Run a coroutine from sync code (e.g. the CLI) and close async clients."""
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await aclose_clients()
+    return asyncio.run(runner())
+
+# =============================================================================
+# Requests with retry
+# =============================================================================
+
+# Transient statuses worth retrying. Only GETs are retried on these, so a
+# flaky POST can never start two conversations or sandboxes.
+_RETRY_STATUSES = {429, 502, 503, 504}
+_MAX_ATTEMPTS = 5
+_MAX_BACKOFF = 30.0
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before the next attempt.
+    
+    Honors Retry-After (seconds or HTTP date), else exponential backoff
+    with jitter: ~1s, 2s, 4s, ... capped at _MAX_BACKOFF.
+    """
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0.0), _MAX_BACKOFF)
+    return min(2 ** attempt + random.random(), _MAX_BACKOFF)
+
+def _should_retry(method: str, response: httpx.Response, attempt: int) -> bool:
+    return (
+        method == "GET"
+        and response.status_code in _RETRY_STATUSES
+        and attempt < _MAX_ATTEMPTS - 1
+    )
+
+def _json_body(kwargs: dict) -> dict:
+    """Serialize a json= payload once, with orjson when available, as content=.
+    
+    The payload is only rendered for display when debug logging is on
+    (OPENHANDS_DEBUG=1), reusing the already-encoded bytes.
+    """
+    if "json" not in kwargs:
+        return kwargs
+    body = _encode(kwargs.pop("json"))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[PAYLOAD] %s", body.decode())
+    kwargs["content"] = body
+    kwargs["headers"] = {**(kwargs.get("headers") or {}), "Content-Type": "application/json"}
+    return kwargs
+
+def _build_request(client, method: str, url: str, **kwargs) -> httpx.Request:
+    """Build a request against the client's base_url and log the final URL."""
+    request = client.build_request(method, url, **_json_body(kwargs))
+    print(f"[API CALL] {method} {request.url}")
+    return request
+
+def _request(client: httpx.Client, method: str, url: str, **kwargs) -> httpx.Response:
+    """Send a request, retrying transient failures of GETs with backoff."""
+    request = _build_request(client, method, url, **kwargs)
+    attempt = 0
+    while True:
+        response = client.send(request)
+        if not _should_retry(method, response, attempt):
+            return response
+        delay = _retry_delay(response, attempt)
+        print(f"[RETRY] HTTP {response.status_code}, attempt {attempt + 2}/{_MAX_ATTEMPTS} in {delay:.1f}s")
+        response.close()
+        time.sleep(delay)
+        attempt += 1
+
+async def _arequest(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+    """Async counterpart of _request."""
+    request = _build_request(client, method, url, **kwargs)
+    attempt = 0
+    while True:
+        response = await client.send(request)
+        if not _should_retry(method, response, attempt):
+            return response
+        delay = _retry_delay(response, attempt)
+        print(f"[RETRY] HTTP {response.status_code}, attempt {attempt + 2}/{_MAX_ATTEMPTS} in {delay:.1f}s")
+        await response.aclose()
+        await asyncio.sleep(delay)
+        attempt += 1
+
+# Expected failures (bad key, unknown ID, still rate limited after retries)
+# come back as an error result instead of raising, so a batch of probes in
+# gather_reads() neither pays for an exception per miss nor aborts on one.
+_EXPECTED_ERRORS = frozenset({401, 403, 404, 429})
+
+def _handle_error(response: httpx.Response) -> dict:
+    """Error result for expected statuses; raise HTTPStatusError for the rest."""
+    response.read()  # no-op unless streamed
+    if response.status_code in _EXPECTED_ERRORS:
+        return {"_error": response.status_code, "_body": response.text}
+    response.raise_for_status()
+
+def is_error(result) -> bool:
+    """True if result is an error result from _handle_error()."""
+    return isinstance(result, dict) and "_error" in result
+
+def _decode(response: httpx.Response):
+    """Decode a JSON response body, using orjson when available."""
+    if logger.isEnabledFor(logging.DEBUG) and "content-encoding" in response.headers:
+        logger.debug(
+            "[ENCODING] %s: %d bytes on the wire, %d decoded",
+            response.headers["content-encoding"],
+            response.num_bytes_downloaded,
+            len(response.content),
+        )
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def _parse_count(response: httpx.Response) -> int:
+    """Parse a /count body without the JSON parser.
+    
+    The count endpoints return a bare integer (e.g. ``604``); ``{"count": N}``
+    is accepted too, in case an endpoint wraps it.
+    """
+    body = response.content
+    try:
+        return int(body)
+    except ValueError:
+        return _decode(response)["count"]
+
+def _encode(data) -> bytes:
+    """Encode a request payload as JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode()
+
+def write_json(data):
+    """Write data to stdout as indented JSON. Unknown types fall back to str().
+    
+    orjson output goes straight to the byte buffer; the stdlib fallback
+    writes incrementally. Neither builds an extra str copy of large results.
+    """
+    buffer = getattr(sys.stdout, "buffer", None)
+    if orjson is not None and buffer is not None:
+        sys.stdout.flush()  # keep ordering with earlier print() output
+        buffer.write(orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        buffer.write(b"\n")
+        buffer.flush()
+    else:
+        json.dump(data, sys.stdout, indent=2, default=str)
+        sys.stdout.write("\n")
+
 def pretty_print(data, title=None):
     """Pretty print JSON data."""
     if title:
         print(f"\n{'='*60}")
         print(f" {title}")
         print(f"{'='*60}")
-    print(json.dumps(data, indent=2, default=str))
+    write_json(data)
 
 # =============================================================================
 # App Conversations
@@ -41,26 +416,26 @@ def pretty_print(data, title=None):
 
 def search_app_conversations(limit: int = 1):
     """Search app conversations. ONE API call."""
-    url = f"{API_V1_URL}/app-conversations/search"
+    url = _URLS["app_conv_search"]
     params = {"limit": limit}
     
-    print(f"[API CALL] GET {url} params={params}")
-    response = httpx.get(url, headers=get_headers(), params=params, timeout=30)
-    response.raise_for_status()
-    return response.json()
+    response = _request(_get_client(), "GET", url, params=params)
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
 
 def get_app_conversation(conversation_id: str):
     """Get a single app conversation by ID. ONE API call.
     
     Uses the batch endpoint since single-ID endpoint may have issues.
     """
-    url = f"{API_V1_URL}/app-conversations"
+    url = _URLS["app_convs"]
     params = {"ids": conversation_id}
     
-    print(f"[API CALL] GET {url} params={params}")
-    response = httpx.get(url, headers=get_headers(), params=params, timeout=30)
-    response.raise_for_status()
-    result = response.json()
+    response = _request(_get_client(), "GET", url, params=params, extensions=_NO_CACHE)
+    if not response.is_success:
+        return _handle_error(response)
+    result = _decode(response)
     # Batch endpoint returns a list
     if result and len(result) > 0:
         return result[0]
@@ -68,12 +443,12 @@ def get_app_conversation(conversation_id: str):
 
 def count_app_conversations():
     """Count all app conversations. ONE API call."""
-    url = f"{API_V1_URL}/app-conversations/count"
+    url = _URLS["app_conv_count"]
     
-    print(f"[API CALL] GET {url}")
-    response = httpx.get(url, headers=get_headers(), timeout=30)
-    response.raise_for_status()
-    return response.json()
+    response = _request(_get_client(), "GET", url)
+    if not response.is_success:
+        return _handle_error(response)
+    return _parse_count(response)
 
 # =============================================================================
 # Sandboxes
@@ -81,13 +456,13 @@ def count_app_conversations():
 
 def search_sandboxes(limit: int = 1):
     """Search sandboxes. ONE API call."""
-    url = f"{API_V1_URL}/sandboxes/search"
+    url = _URLS["sandbox_search"]
     params = {"limit": limit}
     
-    print(f"[API CALL] GET {url} params={params}")
-    response = httpx.get(url, headers=get_headers(), params=params, timeout=30)
-    response.raise_for_status()
-    return response.json()
+    response = _request(_get_client(), "GET", url, params=params)
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
 
 # =============================================================================
 # Sandbox Specs
@@ -95,13 +470,13 @@ def search_sandboxes(limit: int = 1):
 
 def search_sandbox_specs(limit: int = 1):
     """Search sandbox specs. ONE API call."""
-    url = f"{API_V1_URL}/sandbox-specs/search"
+    url = _URLS["sandbox_spec_search"]
     params = {"limit": limit}
     
-    print(f"[API CALL] GET {url} params={params}")
-    response = httpx.get(url, headers=get_headers(), params=params, timeout=30)
-    response.raise_for_status()
-    return response.json()
+    response = _request(_get_client(), "GET", url, params=params)
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
 
 # =============================================================================
 # Events
@@ -109,22 +484,22 @@ def search_sandbox_specs(limit: int = 1):
 
 def search_events(conversation_id: str, limit: int = 1):
     """Search events for a conversation. ONE API call."""
-    url = f"{API_V1_URL}/conversation/{conversation_id}/events/search"
+    url = _URLS["events_search"].format(conversation_id)
     params = {"limit": limit}
     
-    print(f"[API CALL] GET {url} params={params}")
-    response = httpx.get(url, headers=get_headers(), params=params, timeout=30)
-    response.raise_for_status()
-    return response.json()
+    response = _request(_get_client(), "GET", url, params=params)
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
 
 def count_events(conversation_id: str):
     """Count events for a conversation. ONE API call."""
-    url = f"{API_V1_URL}/conversation/{conversation_id}/events/count"
+    url = _URLS["events_count"].format(conversation_id)
     
-    print(f"[API CALL] GET {url}")
-    response = httpx.get(url, headers=get_headers(), timeout=30)
-    response.raise_for_status()
-    return response.json()
+    response = _request(_get_client(), "GET", url)
+    if not response.is_success:
+        return _handle_error(response)
+    return _parse_count(response)
 
 # =============================================================================
 # Agent Server Events
@@ -137,14 +512,16 @@ def agent_search_events(
     limit: int = 1,
 ):
     """Search events for a conversation via agent server. ONE API call."""
-    url = f"{agent_server_url}/api/conversations/{conversation_id}/events/search"
+    url = _URLS["agent_events_search"].format(conversation_id)
     params = {"limit": limit}
     headers = get_agent_server_headers(session_api_key)
 
-    print(f"[API CALL] GET {url} params={params}")
-    response = httpx.get(url, headers=headers, params=params, timeout=30)
-    response.raise_for_status()
-    return response.json()
+    response = _request(
+        _get_agent_client(agent_server_url), "GET", url, headers=headers, params=params
+    )
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
 
 
 def agent_count_events(
@@ -153,13 +530,13 @@ def agent_count_events(
     conversation_id: str,
 ):
     """Count events for a conversation via agent server. ONE API call."""
-    url = f"{agent_server_url}/api/conversations/{conversation_id}/events/count"
+    url = _URLS["agent_events_count"].format(conversation_id)
     headers = get_agent_server_headers(session_api_key)
 
-    print(f"[API CALL] GET {url}")
-    response = httpx.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
-    return response.json()
+    response = _request(_get_agent_client(agent_server_url), "GET", url, headers=headers)
+    if not response.is_success:
+        return _handle_error(response)
+    return _parse_count(response)
 
 
 # =============================================================================
@@ -168,12 +545,12 @@ def agent_count_events(
 
 def get_current_user():
     """Get current authenticated user. ONE API call."""
-    url = f"{API_V1_URL}/users/me"
+    url = _URLS["users_me"]
     
-    print(f"[API CALL] GET {url}")
-    response = httpx.get(url, headers=get_headers(), timeout=30)
-    response.raise_for_status()
-    return response.json()
+    response = _request(_get_client(), "GET", url)
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
 
 # =============================================================================
 # Write Operations - Phase 2
@@ -189,7 +566,7 @@ def start_app_conversation(
     
     WARNING: This creates a sandbox which may incur costs.
     """
-    url = f"{API_V1_URL}/app-conversations"
+    url = _URLS["app_convs"]
     
     # Build the request payload
     payload = {
@@ -207,45 +584,72 @@ def start_app_conversation(
     if title:
         payload["title"] = title
     
-    print(f"[API CALL] POST {url}")
-    print(f"[PAYLOAD] {json.dumps(payload, indent=2)}")
-    response = httpx.post(url, headers=get_headers(), json=payload, timeout=120)
-    response.raise_for_status()
-    return response.json()
+    response = _request(_get_client(), "POST", url, json=payload, timeout=120)
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
 
 def resume_sandbox(sandbox_id: str):
     """Resume a paused sandbox. ONE API call."""
-    url = f"{API_V1_URL}/sandboxes/{sandbox_id}/resume"
+    url = _URLS["sandbox_resume"].format(sandbox_id)
     
-    print(f"[API CALL] POST {url}")
-    response = httpx.post(url, headers=get_headers(), timeout=60)
-    response.raise_for_status()
-    return response.json()
+    response = _request(_get_client(), "POST", url, timeout=60)
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
 
 def pause_sandbox(sandbox_id: str):
     """Pause a running sandbox. ONE API call."""
-    url = f"{API_V1_URL}/sandboxes/{sandbox_id}/pause"
+    url = _URLS["sandbox_pause"].format(sandbox_id)
     
-    print(f"[API CALL] POST {url}")
-    response = httpx.post(url, headers=get_headers(), timeout=60)
-    response.raise_for_status()
-    return response.json()
+    response = _request(_get_client(), "POST", url, timeout=60)
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
 
-def download_trajectory(conversation_id: str, output_file: str | None = None):
-    """Download conversation trajectory as zip. ONE API call."""
-    url = f"{API_V1_URL}/app-conversations/{conversation_id}/download"
+@contextlib.contextmanager
+def _stream(client: httpx.Client, method: str, url: str, **kwargs):
+    """Like client.stream(), logging the request the same way as _request."""
+    response = client.send(_build_request(client, method, url, **kwargs), stream=True)
+    try:
+        yield response
+    finally:
+        response.close()
+
+def _stream_to_file(response: httpx.Response, output_file: str, chunk_size: int) -> int:
+    """Write a streamed response body to disk chunk by chunk. Returns bytes written."""
+    size = 0
+    with open(output_file, "wb") as f:
+        for chunk in response.iter_bytes(chunk_size):
+            f.write(chunk)
+            size += len(chunk)
+    return size
+
+def download_trajectory(
+    conversation_id: str,
+    output_file: str | None = None,
+    chunk_size: int = 64 * 1024,
+):
+    """Download conversation trajectory as zip. ONE API call.
     
-    print(f"[API CALL] GET {url}")
-    response = httpx.get(url, headers=get_headers(), timeout=60)
-    response.raise_for_status()
+    The body is streamed in chunk_size pieces, so memory stays flat
+    regardless of the zip size. Compression is not requested since a zip
+    is already compressed.
+    """
+    url = _URLS["app_conv_download"].format(conversation_id)
+    headers = {"Accept-Encoding": "identity"}  # already a zip
     
-    if output_file:
-        with open(output_file, "wb") as f:
-            f.write(response.content)
-        print(f"[SAVED] {output_file} ({len(response.content)} bytes)")
-        return {"file": output_file, "size": len(response.content)}
-    else:
-        return {"size": len(response.content), "content_type": response.headers.get("content-type")}
+    with _stream(
+        _get_client(), "GET", url, headers=headers, timeout=60, extensions=_NO_CACHE
+    ) as response:
+        if not response.is_success:
+            return _handle_error(response)
+        if output_file:
+            size = _stream_to_file(response, output_file, chunk_size)
+            print(f"[SAVED] {output_file} ({size} bytes)")
+            return {"file": output_file, "size": size}
+        size = sum(len(chunk) for chunk in response.iter_bytes(chunk_size))
+        return {"size": size, "content_type": response.headers.get("content-type")}
 
 def get_start_task(task_id: str):
     """Get start task status. ONE API call.
@@ -253,13 +657,13 @@ def get_start_task(task_id: str):
     The start task tracks the async process of creating a conversation.
     When status is READY, app_conversation_id will be populated.
     """
-    url = f"{API_V1_URL}/app-conversations/start-tasks"
+    url = _URLS["start_tasks"]
     params = {"ids": task_id}
     
-    print(f"[API CALL] GET {url} params={params}")
-    response = httpx.get(url, headers=get_headers(), params=params, timeout=30)
-    response.raise_for_status()
-    result = response.json()
+    response = _request(_get_client(), "GET", url, params=params, extensions=_NO_CACHE)
+    if not response.is_success:
+        return _handle_error(response)
+    result = _decode(response)
     # Returns a list, get the first item
     if result and len(result) > 0:
         return result[0]
@@ -270,8 +674,12 @@ def get_start_task(task_id: str):
 # These run against the sandbox's agent server URL, not the app server
 # =============================================================================
 
+@functools.lru_cache(maxsize=32)
 def get_agent_server_headers(session_api_key: str):
-    """Get headers for Agent Server requests."""
+    """Get headers for Agent Server requests.
+    
+    Cached per session key, so treat the returned dict as read-only.
+    """
     return {
         "X-Session-API-Key": session_api_key,
         "Content-Type": "application/json",
@@ -279,69 +687,239 @@ def get_agent_server_headers(session_api_key: str):
 
 def agent_execute_bash(agent_server_url: str, session_api_key: str, command: str, cwd: str | None = None):
     """Execute a bash command in the sandbox. ONE API call."""
-    url = f"{agent_server_url}/api/bash/execute_bash_command"
+    url = _URLS["agent_bash"]
     headers = get_agent_server_headers(session_api_key)
     payload = {"command": command, "timeout": 30}
     if cwd:
         payload["cwd"] = cwd
     
-    print(f"[API CALL] POST {url}")
-    print(f"[PAYLOAD] {json.dumps(payload)}")
-    response = httpx.post(url, headers=headers, json=payload, timeout=60)
-    response.raise_for_status()
-    return response.json()
+    response = _request(
+        _get_agent_client(agent_server_url), "POST", url, headers=headers, json=payload, timeout=60
+    )
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
 
-def agent_download_file(agent_server_url: str, session_api_key: str, path: str) -> bytes:
+def agent_download_file(agent_server_url: str, session_api_key: str, path: str) -> bytes | dict:
     """Download a file from the sandbox workspace. ONE API call.
     
     Path must be absolute (e.g., /workspace/project/file.txt).
-    Returns raw bytes to support both text and binary files.
+    Returns raw bytes to support both text and binary files
+    (or an error result, e.g. for a missing file).
     """
     # Path must be absolute, keep the leading /
     if not path.startswith("/"):
         path = "/" + path
-    url = f"{agent_server_url}/api/file/download{path}"
+    url = _URLS["agent_file_download"].format(path)
     headers = get_agent_server_headers(session_api_key)
     
-    print(f"[API CALL] GET {url}")
-    response = httpx.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
+    response = _request(_get_agent_client(agent_server_url), "GET", url, headers=headers)
+    if not response.is_success:
+        return _handle_error(response)
     return response.content
 
-def agent_upload_file(agent_server_url: str, session_api_key: str, path: str, content: str):
+def agent_download_file_to(
+    agent_server_url: str,
+    session_api_key: str,
+    path: str,
+    output_file: str,
+    chunk_size: int = 64 * 1024,
+):
+    """Download a file from the sandbox workspace straight to disk. ONE API call.
+    
+    Like agent_download_file, but streams the body instead of holding it
+    in memory. Use this for large files.
+    """
+    if not path.startswith("/"):
+        path = "/" + path
+    url = _URLS["agent_file_download"].format(path)
+    headers = get_agent_server_headers(session_api_key)
+    
+    with _stream(_get_agent_client(agent_server_url), "GET", url, headers=headers) as response:
+        if not response.is_success:
+            return _handle_error(response)
+        size = _stream_to_file(response, output_file, chunk_size)
+    print(f"[SAVED] {output_file} ({size} bytes)")
+    return {"file": output_file, "size": size}
+
+def agent_upload_file(
+    agent_server_url: str,
+    session_api_key: str,
+    path: str,
+    content: str | None = None,
+    *,
+    source: str | bytes | BinaryIO | None = None,
+):
     """Upload a file to the sandbox workspace. ONE API call.
     
     Uses multipart form upload as required by the Agent Server.
+    Pass either `content` (text) or `source`: a local file path, bytes, or
+    a binary file object. Paths and file objects are streamed in chunks
+    rather than read into memory.
     """
+    if (content is None) == (source is None):
+        raise ValueError("Provide exactly one of content or source")
     # Path must be absolute in the URL
     if not path.startswith("/"):
         path = "/" + path
-    url = f"{agent_server_url}/api/file/upload{path}"
+    url = _URLS["agent_file_upload"].format(path)
     headers = {"X-Session-API-Key": session_api_key}  # No Content-Type for multipart
     
     # Create multipart form data with actual filename
     filename = os.path.basename(path)
-    files = {"file": (filename, content.encode(), "text/plain")}
-    
-    print(f"[API CALL] POST {url}")
-    print(f"[CONTENT LENGTH] {len(content)} chars")
-    response = httpx.post(url, headers=headers, files=files, timeout=30)
-    response.raise_for_status()
-    return response.json() if response.text else {"success": True}
+    with contextlib.ExitStack() as stack:
+        if content is not None:
+            body, content_type = content.encode(), "text/plain"
+            size = f"{len(content)} chars"
+        elif isinstance(source, str):
+            body, content_type = stack.enter_context(open(source, "rb")), "application/octet-stream"
+            size = f"{os.path.getsize(source)} bytes"
+        else:
+            body, content_type = source, "application/octet-stream"
+            size = f"{len(source)} bytes" if isinstance(source, bytes) else "streamed"
+        files = {"file": (filename, body, content_type)}
+        
+        print(f"[CONTENT LENGTH] {size}")
+        response = _request(
+            _get_agent_client(agent_server_url), "POST", url, headers=headers, files=files
+        )
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response) if response.content else {"success": True}
+
+# =============================================================================
+# Async Read Operations
+# Same endpoints as the sync helpers above. Each coroutine makes ONE API call;
+# gather_reads() runs several at once so N reads cost max(latency), not sum.
+# =============================================================================
+
+async def search_app_conversations_async(limit: int = 1):
+    """Async search_app_conversations. ONE API call."""
+    url = _URLS["app_conv_search"]
+    params = {"limit": limit}
+
+    response = await _arequest(_get_async_client(), "GET", url, params=params)
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
+
+async def count_app_conversations_async():
+    """Async count_app_conversations. ONE API call."""
+    url = _URLS["app_conv_count"]
+
+    response = await _arequest(_get_async_client(), "GET", url)
+    if not response.is_success:
+        return _handle_error(response)
+    return _parse_count(response)
+
+async def search_sandboxes_async(limit: int = 1):
+    """Async search_sandboxes. ONE API call."""
+    url = _URLS["sandbox_search"]
+    params = {"limit": limit}
+
+    response = await _arequest(_get_async_client(), "GET", url, params=params)
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
+
+async def search_sandbox_specs_async(limit: int = 1):
+    """Async search_sandbox_specs. ONE API call."""
+    url = _URLS["sandbox_spec_search"]
+    params = {"limit": limit}
+
+    response = await _arequest(_get_async_client(), "GET", url, params=params)
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
+
+async def search_events_async(conversation_id: str, limit: int = 1):
+    """Async search_events. ONE API call."""
+    url = _URLS["events_search"].format(conversation_id)
+    params = {"limit": limit}
+
+    response = await _arequest(_get_async_client(), "GET", url, params=params)
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
+
+async def count_events_async(conversation_id: str):
+    """Async count_events. ONE API call."""
+    url = _URLS["events_count"].format(conversation_id)
+
+    response = await _arequest(_get_async_client(), "GET", url)
+    if not response.is_success:
+        return _handle_error(response)
+    return _parse_count(response)
+
+async def get_current_user_async():
+    """Async get_current_user. ONE API call."""
+    url = _URLS["users_me"]
+
+    response = await _arequest(_get_async_client(), "GET", url)
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
+
+async def agent_search_events_async(
+    agent_server_url: str,
+    session_api_key: str,
+    conversation_id: str,
+    limit: int = 1,
+):
+    """Async agent_search_events. ONE API call."""
+    url = _URLS["agent_events_search"].format(conversation_id)
+    params = {"limit": limit}
+    headers = get_agent_server_headers(session_api_key)
+
+    response = await _arequest(
+        _get_async_agent_client(agent_server_url), "GET", url, headers=headers, params=params
+    )
+    if not response.is_success:
+        return _handle_error(response)
+    return _decode(response)
+
+async def agent_count_events_async(
+    agent_server_url: str,
+    session_api_key: str,
+    conversation_id: str,
+):
+    """Async agent_count_events. ONE API call."""
+    url = _URLS["agent_events_count"].format(conversation_id)
+    headers = get_agent_server_headers(session_api_key)
+
+    response = await _arequest(
+        _get_async_agent_client(agent_server_url), "GET", url, headers=headers
+    )
+    if not response.is_success:
+        return _handle_error(response)
+    return _parse_count(response)
+
+async def gather_reads(*coros):
+    """Run read coroutines concurrently. Results keep the order of the inputs."""
+    return await asyncio.gather(*coros)
+
+async def fetch_many_counts(conversation_ids: list[str]):
+    """Count events for several conversations concurrently. ONE API call per ID."""
+    return await gather_reads(*(count_events_async(cid) for cid in conversation_ids))
 
 
 # =============================================================================
 # Main - Test ONE endpoint at a time
 # =============================================================================
 
-def run_test(name: str, func, *args, **kwargs):
-    """Run a single test with error handling."""
+def run_test(name: str, func, *args, quiet: bool = False, **kwargs):
+    """Run a single test with error handling. quiet skips printing the result."""
     print(f"\n{'='*60}")
     print(f" TEST: {name}")
     print(f"{'='*60}")
     try:
         result = func(*args, **kwargs)
-        print(json.dumps(result, indent=2, default=str))
+        if is_error(result):
+            print(f"HTTP Error: {result['_error']}")
+            print(f"Response: {result['_body']}")
+            return None
+        if not quiet:
+            write_json(result)
         return result
     except httpx.HTTPStatusError as e:
         print(f"HTTP Error: {e.response.status_code}")
@@ -352,9 +930,127 @@ def run_test(name: str, func, *args, **kwargs):
         return None
 
 
+
+# =============================================================================
+# CLI dispatch table - one entry per test
+# =============================================================================
+
+@dataclass(frozen=True)
+class Cmd:
+    """A CLI test: the function to call and how argv maps onto it."""
+    func: Callable
+    min_args: int
+    arg_names: tuple[str, ...]
+    label: str  # formatted with the positional args
+    group: str
+    kwargs: dict = field(default_factory=dict)
+    varargs: bool = False  # pass every remaining argv entry
+    after: Callable | None = None  # extra output for a successful result
+
+    def usage(self) -> str:
+        names = [f"<{n}>" if i < self.min_args else f"[{n}]" for i, n in enumerate(self.arg_names)]
+        if self.varargs:
+            names.append(f"[<{self.arg_names[-1]}> ...]")
+        return " ".join(names)
+
+
+def _cli_count_events_many(*conversation_ids: str):
+    return run_async(fetch_many_counts(list(conversation_ids)))
+
+def _cli_download_trajectory(conversation_id: str, output_file: str | None = None):
+    return download_trajectory(conversation_id, output_file or f"trajectory_{conversation_id[:8]}.zip")
+
+def _cli_upload_from(agent_server_url: str, session_api_key: str, path: str, local_file: str):
+    return agent_upload_file(agent_server_url, session_api_key, path, source=local_file)
+
+def _print_file_preview(result: bytes):
+    print(f"\n--- File Content ({len(result)} bytes) ---")
+    # Try to decode as UTF-8, show hex preview for binary
+    try:
+        text = result.decode("utf-8")
+        print(text[:2000] if len(text) > 2000 else text)
+    except UnicodeDecodeError:
+        print(f"[Binary file, first 100 bytes hex]: {result[:100].hex()}")
+
+
+_READ = "Read Operations"
+_WRITE = "Write Operations"
+# These require: agent_server_url and session_api_key from a RUNNING sandbox
+_AGENT = "Agent Server Operations (Phase 3)"
+_AGENT_ARGS = ("agent_server_url", "session_api_key")
+
+# Each test makes exactly ONE API call (count_events_many: one per ID)
+DISPATCH: dict[str, Cmd] = {
+    # === Read Operations ===
+    "search_conversations": Cmd(
+        search_app_conversations, 0, (), "Search App Conversations (limit=1)", _READ, {"limit": 1}
+    ),
+    "count_conversations": Cmd(count_app_conversations, 0, (), "Count App Conversations", _READ),
+    "get_conversation": Cmd(
+        get_app_conversation, 1, ("conversation_id",), "Get App Conversation {0}", _READ
+    ),
+    "search_sandboxes": Cmd(
+        search_sandboxes, 0, (), "Search Sandboxes (limit=1)", _READ, {"limit": 1}
+    ),
+    "search_sandbox_specs": Cmd(
+        search_sandbox_specs, 0, (), "Search Sandbox Specs (limit=1)", _READ, {"limit": 1}
+    ),
+    "get_user": Cmd(get_current_user, 0, (), "Get Current User", _READ),
+    "search_events": Cmd(
+        search_events, 1, ("conversation_id",), "Search Events for {0} (limit=5)", _READ, {"limit": 5}
+    ),
+    "count_events": Cmd(count_events, 1, ("conversation_id",), "Count Events for {0}", _READ),
+    "count_events_many": Cmd(
+        _cli_count_events_many, 1, ("conversation_id",), "Count Events for Many Conversations",
+        _READ, varargs=True,
+    ),
+    # === Write Operations (Phase 2) ===
+    "start_conversation": Cmd(
+        start_app_conversation, 1, ("message", "owner/repo", "branch"), "Start App Conversation", _WRITE
+    ),
+    "resume_sandbox": Cmd(resume_sandbox, 1, ("sandbox_id",), "Resume Sandbox {0}", _WRITE),
+    "pause_sandbox": Cmd(pause_sandbox, 1, ("sandbox_id",), "Pause Sandbox {0}", _WRITE),
+    "download_trajectory": Cmd(
+        _cli_download_trajectory, 1, ("conversation_id", "output_file"), "Download Trajectory {0}", _WRITE
+    ),
+    "get_start_task": Cmd(get_start_task, 1, ("start_task_id",), "Get Start Task {0}", _WRITE),
+    # === Agent Server Operations (Phase 3) ===
+    "agent_search_events": Cmd(
+        agent_search_events, 3, (*_AGENT_ARGS, "conversation_id"),
+        "Agent Search Events {2} (limit=5)", _AGENT, {"limit": 5},
+    ),
+    "agent_count_events": Cmd(
+        agent_count_events, 3, (*_AGENT_ARGS, "conversation_id"), "Agent Count Events {2}", _AGENT
+    ),
+    "agent_bash": Cmd(agent_execute_bash, 3, (*_AGENT_ARGS, "command"), "Execute Bash: {2}", _AGENT),
+    "agent_download": Cmd(
+        agent_download_file, 3, (*_AGENT_ARGS, "path"), "Download File: {2}", _AGENT,
+        after=_print_file_preview,
+    ),
+    "agent_download_to": Cmd(
+        agent_download_file_to, 4, (*_AGENT_ARGS, "path", "output_file"),
+        "Download File: {2} -> {3}", _AGENT,
+    ),
+    "agent_upload": Cmd(
+        agent_upload_file, 4, (*_AGENT_ARGS, "path", "content"), "Upload File: {2}", _AGENT
+    ),
+    "agent_upload_from": Cmd(
+        _cli_upload_from, 4, (*_AGENT_ARGS, "path", "local_file"), "Upload File: {3} -> {2}", _AGENT
+    ),
+}
+
+
+def print_usage():
+    """Print every registered test, grouped by section."""
+    group = None
+    for name, cmd in DISPATCH.items():
+        if cmd.group != group:
+            group = cmd.group
+            print(f"\n{group}:")
+        print(f"  {name} {cmd.usage()}".rstrip())
+
+
 if __name__ == "__main__":
-    import sys
-    
     if not API_KEY:
         print("ERROR: Set OPENHANDS_API_KEY environment variable")
         exit(1)
@@ -362,180 +1058,27 @@ if __name__ == "__main__":
     print(f"Base URL: {BASE_URL}")
     print(f"API Key: {API_KEY[:10]}...{API_KEY[-4:]}")
     
-    # Usage: python cloud_api_v1.py [test_name] [arg1] [arg2] ...
-    # Read tests: search_conversations, count_conversations, get_conversation,
-    #             search_sandboxes, search_sandbox_specs, get_user,
-    #             search_events, count_events
-    # Agent server tests: agent_search_events, agent_count_events, agent_bash,
-    #                     agent_download, agent_upload
-    # Write tests: start_conversation, resume_sandbox, pause_sandbox, download_trajectory
-    
-    test_name = sys.argv[1] if len(sys.argv) > 1 else "search_conversations"
-    arg1 = sys.argv[2] if len(sys.argv) > 2 else None
-    arg2 = sys.argv[3] if len(sys.argv) > 3 else None
-    
-    # Each test makes exactly ONE API call
-    
-    # === Read Operations ===
-    if test_name == "search_conversations":
-        run_test("Search App Conversations (limit=1)", search_app_conversations, limit=1)
-    
-    elif test_name == "count_conversations":
-        run_test("Count App Conversations", count_app_conversations)
-    
-    elif test_name == "get_conversation":
-        if not arg1:
-            print("ERROR: Provide conversation_id as second argument")
-            exit(1)
-        run_test(f"Get App Conversation {arg1}", get_app_conversation, arg1)
+    # OPENHANDS_DEBUG=1 shows request payloads
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(logging.DEBUG if os.environ.get("OPENHANDS_DEBUG") else logging.INFO)
     
-    elif test_name == "search_sandboxes":
-        run_test("Search Sandboxes (limit=1)", search_sandboxes, limit=1)
-    
-    elif test_name == "search_sandbox_specs":
-        run_test("Search Sandbox Specs (limit=1)", search_sandbox_specs, limit=1)
-    
-    elif test_name == "get_user":
-        run_test("Get Current User", get_current_user)
-    
-    elif test_name == "search_events":
-        if not arg1:
-            print("ERROR: Provide conversation_id as second argument")
-            exit(1)
-        run_test(f"Search Events for {arg1} (limit=5)", search_events, arg1, limit=5)
-    
-    elif test_name == "count_events":
-        if not arg1:
-            print("ERROR: Provide conversation_id as second argument")
-            exit(1)
-        run_test(f"Count Events for {arg1}", count_events, arg1)
-    
-    # === Write Operations (Phase 2) ===
-    elif test_name == "start_conversation":
-        # Usage: start_conversation "message" [repo] [branch]
-        if not arg1:
-            print("ERROR: Provide initial message as second argument")
-            print("Usage: start_conversation 'Your message here' [owner/repo] [branch]")
-            exit(1)
-        repo = arg2
-        branch = sys.argv[4] if len(sys.argv) > 4 else None
-        run_test("Start App Conversation", start_app_conversation, arg1, repo, branch)
-    
-    elif test_name == "resume_sandbox":
-        if not arg1:
-            print("ERROR: Provide sandbox_id as second argument")
-            exit(1)
-        run_test(f"Resume Sandbox {arg1}", resume_sandbox, arg1)
-    
-    elif test_name == "pause_sandbox":
-        if not arg1:
-            print("ERROR: Provide sandbox_id as second argument")
-            exit(1)
-        run_test(f"Pause Sandbox {arg1}", pause_sandbox, arg1)
-    
-    elif test_name == "download_trajectory":
-        if not arg1:
-            print("ERROR: Provide conversation_id as second argument")
-            exit(1)
-        output_file = arg2 or f"trajectory_{arg1[:8]}.zip"
-        run_test(f"Download Trajectory {arg1}", download_trajectory, arg1, output_file)
-    
-    elif test_name == "get_start_task":
-        if not arg1:
-            print("ERROR: Provide start_task_id as second argument")
-            exit(1)
-        run_test(f"Get Start Task {arg1}", get_start_task, arg1)
+    # Usage: python cloud_api_v1.py [--quiet] [test_name] [arg1] [arg2] ...
+    # See DISPATCH above (or run with an unknown test name) for the list of tests.
+    # --quiet skips printing the result, for scripted/piped use.
+    quiet = "--quiet" in sys.argv
+    argv = [a for a in sys.argv if a != "--quiet"]
+    test_name = argv[1] if len(argv) > 1 else "search_conversations"
+    cmd = DISPATCH.get(test_name)
+    if cmd is None:
+        print(f"Unknown test: {test_name}")
+        print_usage()
+        exit(1)
     
-    # === Agent Server Operations (Phase 3) ===
-    # These require: agent_server_url and session_api_key from a RUNNING sandbox
-    elif test_name == "agent_search_events":
-        # Usage: agent_search_events <agent_server_url> <session_api_key> <conversation_id>
-        if len(sys.argv) < 5:
-            print(f"ERROR: {test_name} <agent_server_url> <session_api_key> <conversation_id>")
-            exit(1)
-        agent_url = sys.argv[2]
-        session_key = sys.argv[3]
-        conversation_id = sys.argv[4]
-        run_test(
-            f"Agent Search Events {conversation_id} (limit=5)",
-            agent_search_events,
-            agent_url,
-            session_key,
-            conversation_id,
-            limit=5,
-        )
-
-    elif test_name == "agent_count_events":
-        # Usage: agent_count_events <agent_server_url> <session_api_key> <conversation_id>
-        if len(sys.argv) < 5:
-            print(f"ERROR: {test_name} <agent_server_url> <session_api_key> <conversation_id>")
-            exit(1)
-        agent_url = sys.argv[2]
-        session_key = sys.argv[3]
-        conversation_id = sys.argv[4]
-        run_test(
-            f"Agent Count Events {conversation_id}",
-            agent_count_events,
-            agent_url,
-            session_key,
-            conversation_id,
-        )
-
-
-    elif test_name == "agent_bash":
-        # Usage: agent_bash <agent_server_url> <session_api_key> <command>
-        if len(sys.argv) < 5:
-            print("ERROR: agent_bash <agent_server_url> <session_api_key> <command>")
-            exit(1)
-        agent_url = sys.argv[2]
-        session_key = sys.argv[3]
-        command = sys.argv[4]
-        run_test(f"Execute Bash: {command}", agent_execute_bash, agent_url, session_key, command)
-    
-    elif test_name == "agent_download":
-        # Usage: agent_download <agent_server_url> <session_api_key> <path>
-        if len(sys.argv) < 5:
-            print("ERROR: agent_download <agent_server_url> <session_api_key> <path>")
-            exit(1)
-        agent_url = sys.argv[2]
-        session_key = sys.argv[3]
-        path = sys.argv[4]
-        result = run_test(f"Download File: {path}", agent_download_file, agent_url, session_key, path)
-        if result:
-            print(f"\n--- File Content ({len(result)} bytes) ---")
-            # Try to decode as UTF-8, show hex preview for binary
-            try:
-                text = result.decode("utf-8")
-                print(text[:2000] if len(text) > 2000 else text)
-            except UnicodeDecodeError:
-                print(f"[Binary file, first 100 bytes hex]: {result[:100].hex()}")
-    
-    elif test_name == "agent_upload":
-        # Usage: agent_upload <agent_server_url> <session_api_key> <path> <content>
-        if len(sys.argv) < 6:
-            print("ERROR: agent_upload <agent_server_url> <session_api_key> <path> <content>")
-            exit(1)
-        agent_url = sys.argv[2]
-        session_key = sys.argv[3]
-        path = sys.argv[4]
-        content = sys.argv[5]
-        run_test(f"Upload File: {path}", agent_upload_file, agent_url, session_key, path, content)
+    args = argv[2:] if cmd.varargs else argv[2:2 + len(cmd.arg_names)]
+    if len(args) < cmd.min_args:
+        print(f"ERROR: {test_name} {cmd.usage()}")
+        exit(1)
     
-    else:
-        print(f"Unknown test: {test_name}")
-        print("\nRead Operations:")
-        print("  search_conversations, count_conversations, get_conversation <id>")
-        print("  search_sandboxes, search_sandbox_specs, get_user")
-        print("  search_events <conv_id>, count_events <conv_id>")
-        print("\nWrite Operations:")
-        print("  start_conversation 'message' [repo] [branch]")
-        print("  resume_sandbox <sandbox_id>")
-        print("  pause_sandbox <sandbox_id>")
-        print("  download_trajectory <conv_id> [output_file]")
-        print("  get_start_task <task_id>")
-        print("\nAgent Server Operations (Phase 3):")
-        print("  agent_search_events <agent_server_url> <session_api_key> <conversation_id>")
-        print("  agent_count_events <agent_server_url> <session_api_key> <conversation_id>")
-        print("  agent_bash <agent_server_url> <session_api_key> <command>")
-        print("  agent_download <agent_server_url> <session_api_key> <path>")
-        print("  agent_upload <agent_server_url> <session_api_key> <path> <content>")
+    result = run_test(cmd.label.format(*args), cmd.func, *args, quiet=quiet, **cmd.kwargs)
+    if result and cmd.after and not quiet:
+        cmd.after(result)
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """Export an OpenHands Cloud conversation's events to JSON.
 
-This script is intentionally dependency-free (stdlib-only).
+This script is intentionally dependency-free (stdlib-only). If orjson is
+installed it is used for parsing/serializing, which is much faster on large
+exports.
 
 It uses the Cloud management API:
   GET {base_url}/api/conversations/{conversation_id}
@@ -16,20 +18,101 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import gzip
+import http.client
 import json
 import os
+import queue
 import sys
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
-from typing import Any, Dict, Iterable, Optional, Tuple
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from json_io import dump_json, orjson  # orjson is None when not installed
 
 
 DEFAULT_BASE_URL = "https://app.all-hands.dev"
 MAX_LIMIT = 100
 
 
+# Idle keep-alive connections keyed by (scheme, host, port), so paginated
+# fetches reuse one TCP/TLS session instead of reconnecting per page.
+_POOL: Dict[Tuple[str, str, Optional[int]], list[http.client.HTTPConnection]] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def _decode_body(raw: bytes, content_encoding: Optional[str]) -> bytes:
+    if (content_encoding or "").strip().lower() != "gzip":
+        return raw
+    try:
+        return gzip.decompress(raw)
+    except (OSError, EOFError, zlib.error) as e:
+        raise RuntimeError(f"Corrupt gzip response body ({e})") from e
+
+
+def _urllib_get(url: str, headers: Dict[str, str], timeout_s: int) -> Tuple[int, str, bytes]:
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout_s) as resp:
+            raw = _decode_body(resp.read(), resp.headers.get("Content-Encoding"))
+            return resp.status, resp.headers.get("Content-Type", ""), raw
+    except urllib.error.HTTPError as e:
+        raw = e.read() if hasattr(e, "read") else b""
+        if e.headers:
+            raw = _decode_body(raw, e.headers.get("Content-Encoding"))
+        ctype = e.headers.get("Content-Type", "") if e.headers else ""
+        return e.code, ctype, raw
+    except urllib.error.URLError as e:
+        raise RuntimeError(f"Request failed for {url} ({e})") from e
+
+
+def _http_get(url: str, headers: Dict[str, str], timeout_s: int) -> Tuple[int, str, bytes]:
+    parts = urllib.parse.urlsplit(url)
+    host = parts.hostname or ""
+    # Proxied hosts and redirects are left to urllib, which knows how to handle them.
+    if parts.scheme not in {"http", "https"} or (
+        parts.scheme in urllib.request.getproxies() and not urllib.request.proxy_bypass(host)
+    ):
+        return _urllib_get(url, headers, timeout_s)
+
+    key = (parts.scheme, host, parts.port)
+    path = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+    while True:
+        with _POOL_LOCK:
+            idle = _POOL.get(key)
+            conn = idle.pop() if idle else None
+        reused = conn is not None
+        if conn is None:
+            cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            conn = cls(host, parts.port, timeout=timeout_s)
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            raw = resp.read()
+        except (http.client.HTTPException, OSError) as e:
+            conn.close()
+            if reused:  # the server may have dropped an idle connection; retry on a fresh one
+                continue
+            raise RuntimeError(f"Request failed for {url} ({e})") from e
+        break
+
+    if resp.will_close:
+        conn.close()
+    else:
+        with _POOL_LOCK:
+            _POOL.setdefault(key, []).append(conn)
+
+    if resp.status in {301, 302, 303, 307, 308}:
+        return _urllib_get(url, headers, timeout_s)
+    raw = _decode_body(raw, resp.getheader("Content-Encoding"))
+    return resp.status, resp.getheader("Content-Type", ""), raw
+
+
 def _json_request(
     url: str,
     *,
@@ -37,27 +120,23 @@ def _json_request(
     session_key: Optional[str] = None,
     timeout_s: int = 60,
 ) -> Any:
-    req = urllib.request.Request(url)
-    req.add_header("Authorization", f"Bearer {api_key}")
-    req.add_header("Accept", "application/json")
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Accept": "application/json",
+        # Event pages are verbose JSON and compress very well.
+        "Accept-Encoding": "gzip",
+    }
     if session_key:
-        req.add_header("X-Session-API-Key", session_key)
+        headers["X-Session-API-Key"] = session_key
 
-    try:
-        with urllib.request.urlopen(req, timeout=timeout_s) as resp:
-            raw = resp.read()
-            ctype = resp.headers.get("Content-Type", "")
-    except urllib.error.HTTPError as e:
-        raw = e.read() if hasattr(e, "read") else b""
-        ctype = e.headers.get("Content-Type", "") if e.headers else ""
+    status, ctype, raw = _http_get(url, headers, timeout_s)
+    if status >= 400:
         raise RuntimeError(
-            f"HTTP {e.code} for {url} (content-type={ctype!r} body_prefix={raw[:200]!r})"
-        ) from e
-    except urllib.error.URLError as e:
-        raise RuntimeError(f"Request failed for {url} ({e})") from e
+            f"HTTP {status} for {url} (content-type={ctype!r} body_prefix={raw[:200]!r})"
+        )
 
     try:
-        return json.loads(raw.decode("utf-8"))
+        return orjson.loads(raw) if orjson else json.loads(raw.decode("utf-8"))
     except (UnicodeDecodeError, json.JSONDecodeError) as e:
         raise RuntimeError(
             f"Non-JSON response for {url} (content-type={ctype!r} body_prefix={raw[:200]!r})"
@@ -94,24 +173,25 @@ def iter_conversation_events(
     start_id: int = 0,
     limit: int = MAX_LIMIT,
     sleep_s: float = 0.0,
+    prefetch: int = 4,
 ) -> Iterable[Dict[str, Any]]:
     limit = max(1, min(MAX_LIMIT, int(limit)))
 
+    # Only start_id changes between pages (and both values are ints), so
+    # build the URLs by formatting instead of urlencode-ing each page.
+    events_url = _build_url(base_url, f"/api/conversations/{conversation_id}/events")
+    runtime_events_url = _build_url(runtime_url, "/events") if runtime_url else ""
+    query = f"?start_id={{}}&limit={limit}"
+
     def fetch_page(page_start: int) -> Tuple[list[Dict[str, Any]], bool]:
-        params = {"start_id": page_start, "limit": limit}
-        url = _build_url(base_url, f"/api/conversations/{conversation_id}/events", params)
+        page_query = query.format(page_start)
         try:
-            payload = _json_request(url, api_key=api_key)
+            payload = _json_request(events_url + page_query, api_key=api_key)
         except RuntimeError:
             if not runtime_url or not session_key:
                 raise
-            runtime_events_url = _build_url(
-                runtime_url,
-                "/events",
-                {"start_id": page_start, "limit": limit},
-            )
             payload = _json_request(
-                runtime_events_url, api_key=api_key, session_key=session_key
+                runtime_events_url + page_query, api_key=api_key, session_key=session_key
             )
 
         events = payload.get("events") if isinstance(payload, dict) else None
@@ -120,21 +200,88 @@ def iter_conversation_events(
         has_more = bool(payload.get("has_more")) if isinstance(payload, dict) else False
         return events, has_more
 
-    next_start = start_id
-    while True:
-        events, has_more = fetch_page(next_start)
-        if not events:
-            break
-
-        for e in events:
-            if isinstance(e, dict):
-                yield e
+    def fetch_pages() -> Iterator[list[Dict[str, Any]]]:
+        # Event ids are normally contiguous, so the next page usually starts one
+        # page-width after the current one. Keep up to `prefetch` such guesses in
+        # flight and only use a result when its start matches the real next start;
+        # a gap in ids just discards the stale guesses. Throttled runs (--sleep-s)
+        # stay serial.
+        workers = 0 if sleep_s else max(0, int(prefetch))
+        pool = ThreadPoolExecutor(max_workers=workers) if workers else None
+        inflight: Dict[int, Future] = {}
 
-        next_start = int(events[-1].get("id", next_start)) + 1
-        if not has_more:
-            break
-        if sleep_s:
-            time.sleep(sleep_s)
+        try:
+            next_start = start_id
+            while True:
+                page_start = next_start
+                fut = inflight.pop(page_start, None)
+                events, has_more = fut.result() if fut else fetch_page(page_start)
+                if not events:
+                    break
+
+                next_start = int(events[-1].get("id", next_start)) + 1
+                if pool and has_more:
+                    step = max(1, next_start - page_start)
+                    if next_start not in inflight:
+                        for stale in inflight.values():
+                            stale.cancel()
+                        inflight.clear()
+                    guess = max(inflight) + step if inflight else next_start
+                    while len(inflight) < workers:
+                        inflight[guess] = pool.submit(fetch_page, guess)
+                        guess += step
+
+                yield events
+
+                if not has_more:
+                    break
+                if sleep_s:
+                    time.sleep(sleep_s)
+        finally:
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    # Pages are fetched on a producer thread into a small bounded queue, so the
+    # network wait overlaps with whatever the caller does with each event.
+    pages: queue.Queue = queue.Queue(maxsize=2)
+    stop = threading.Event()
+    done = object()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        source = fetch_pages()
+        try:
+            for page in source:
+                if not put(page):
+                    return
+        except BaseException as e:  # re-raised in the consumer
+            put(e)
+        else:
+            put(done)
+        finally:
+            source.close()
+
+    threading.Thread(target=produce, name="event-pages", daemon=True).start()
+    try:
+        while True:
+            item = pages.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            for e in item:
+                if isinstance(e, dict):
+                    yield e
+    finally:
+        stop.set()
 
 
 def main() -> int:
@@ -162,6 +309,12 @@ def main() -> int:
         default=0.0,
         help="Optional sleep between pages (seconds)",
     )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=4,
+        help="Pages to fetch ahead concurrently (default 4, 0 = serial; ignored with --sleep-s)",
+    )
 
     args = parser.parse_args()
 
@@ -186,6 +339,7 @@ def main() -> int:
             start_id=0,
             limit=args.limit,
             sleep_s=args.sleep_s,
+            prefetch=args.prefetch,
         )
     )
 
@@ -197,8 +351,7 @@ def main() -> int:
     }
 
     os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
-    with open(args.out, "w", encoding="utf-8") as f:
-        json.dump(out_obj, f, ensure_ascii=False, indent=2)
+    dump_json(out_obj, args.out)
 
     print(
         f"Wrote {len(events)} events to {args.out} (status={details.get('status')!r}, title={details.get('title')!r})"
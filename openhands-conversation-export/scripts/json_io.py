@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Iterator, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional, enables streaming large exports
+    ijson = None
+
+# Below this size, loading the whole file is faster and memory is not a concern.
+STREAM_MIN_BYTES = 64 << 20
+
+_START = {"start_map", "start_array"}
+_END = {"end_map", "end_array"}
+
+
+def load_json(path: str) -> Any:
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def dumps_json(obj: Any, *, sort_keys: bool = False) -> str:
+    """json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=...), via orjson when available.
+
+    The two agree on everything but float spelling (orjson writes 1.5e300,
+    the stdlib 1.5e+300).
+    """
+    if orjson:
+        option = orjson.OPT_INDENT_2 | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:  # e.g. ints beyond 64 bits; let stdlib handle it
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort_keys)
+
+
+def dump_json(obj: Any, path: str) -> None:
+    if orjson:
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:  # e.g. ints beyond 64 bits; let stdlib handle it
+            pass
+        else:
+            with open(path, "wb") as f:
+                f.write(data)
+            return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+
+
+def should_stream(path: str) -> bool:
+    return ijson is not None and os.path.getsize(path) >= STREAM_MIN_BYTES
+
+
+def stream_json_object(path: str, stream_key: str) -> Iterator[Tuple[str, Any]]:
+    """Yield (key, value) for each member of the top-level JSON object in `path`.
+
+    Requires ijson. Every value is built in full except `stream_key`: if it
+    holds an array, its value is a lazy iterator over the items, parsed one at
+    a time (consume it before advancing to the next member).
+    """
+    with open(path, "rb") as f:
+        events = ijson.parse(f, use_float=True)
+        if next(events)[1] != "start_map":
+            raise ValueError(f"{path}: top-level JSON value is not an object")
+        for _, event, key in events:
+            if event == "end_map":
+                return
+            _, event, value = next(events)
+            if key == stream_key and event == "start_array":
+                items = _iter_array(events)
+                yield key, items
+                for _ in items:  # skip whatever the caller left unread
+                    pass
+            else:
+                yield key, _build(events, event, value)
+
+
+def _iter_array(events: Iterator[Tuple[str, str, Any]]) -> Iterator[Any]:
+    for _, event, value in events:
+        if event == "end_array":
+            return
+        yield _build(events, event, value)
+
+
+def _build(events: Iterator[Tuple[str, str, Any]], event: str, value: Any) -> Any:
+    if event not in _START:
+        return value
+    builder = ijson.ObjectBuilder()
+    builder.event(event, value)
+    depth = 1
+    for _, event, value in events:
+        builder.event(event, value)
+        if event in _START:
+            depth += 1
+        elif event in _END:
+            depth -= 1
+            if not depth:
+                break
+    return builder.value
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
 
 REDACTION_PATTERNS: list[tuple[re.Pattern[str], str]] = [
@@ -11,8 +12,38 @@ REDACTION_PATTERNS: list[tuple[re.Pattern[str], str]] = [
     (re.compile(r"(Authorization:\s*Bearer\s+)([^\s\"]+)", re.IGNORECASE), r"\1<redacted>"),
 ]
 
+# Union of the patterns above: one scan tells whether a string needs redacting
+# at all. Substitution itself stays sequential, since later patterns can match
+# across earlier replacements (e.g. a bearer value containing a token URL).
+_ANY_SECRET_RX = re.compile(
+    r"\b(?:ghu_|ghp_|github_pat_)[A-Za-z0-9_]{20,}\b"
+    r"|https?://[^/@\s]+@github\.com"
+    r"|(?i:Authorization:\s*Bearer\s+)[^\s\"]+"
+)
 
-def redact_secrets(s: str) -> str:
+# Every match above contains one of these literals; plain substring tests are
+# far cheaper than the regex scan and rule out almost every string.
+_TRIGGERS = ("ghu_", "ghp_", "github_pat_", "@github.com")
+_AUTH_TRIGGER_RX = re.compile(r"authorization:", re.IGNORECASE)
+
+
+# Short strings (tool names, headers, short messages) repeat a lot within an
+# export; big tool outputs are rarely seen twice and would just bloat the cache.
+_CACHE_MAX_LEN = 4096
+
+
+def _redact(s: str) -> str:
+    if not any(t in s for t in _TRIGGERS) and not _AUTH_TRIGGER_RX.search(s):
+        return s
+    if not _ANY_SECRET_RX.search(s):
+        return s
     for pat, repl in REDACTION_PATTERNS:
         s = pat.sub(repl, s)
     return s
+
+
+_redact_cached = lru_cache(maxsize=8192)(_redact)
+
+
+def redact_secrets(s: str) -> str:
+    return _redact_cached(s) if len(s) < _CACHE_MAX_LEN else _redact(s)
@@ -13,10 +13,15 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
-import json
+import io
 import os
-from typing import Any, Dict, List, Optional
+import re
+import time
+from functools import lru_cache, partial
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
 
+import json_io
+from json_io import dumps_json, load_json
 from redaction import redact_secrets
 
 
@@ -39,6 +44,9 @@ def _get_text(event: Dict[str, Any]) -> str:
 
 
 def _truncate(s: str, head: int, tail: int) -> str:
+    # Redact the whole string, not just the kept windows: bearer values and
+    # URL credentials have no length bound and can run across the cut.
+    # redact_secrets is cheap on strings without a trigger substring.
     s = redact_secrets(s)
     head = max(0, head)
     tail = max(0, tail)
@@ -52,10 +60,24 @@ def _truncate(s: str, head: int, tail: int) -> str:
     return f"{prefix}...<truncated {removed} chars>...{suffix}"
 
 
+# Timestamps already in the canonical UTC form that _fmt_ts produces (the
+# fraction is omitted, not zero-filled, when it's zero). Those with a "Z" come
+# back unchanged; naive ones just gain the "Z" when local time is UTC.
+_CANONICAL_TS_RX = re.compile(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(?:\.(?!0{6})\d{6})?(Z?)")
+_LOCAL_IS_UTC = time.timezone == 0 and not time.daylight and time.tzname[0] in {"UTC", "GMT"}
+
+
+@lru_cache(maxsize=4096)
 def _fmt_ts(ts: Optional[str]) -> str:
     if not ts:
         return ""
+    m = _CANONICAL_TS_RX.fullmatch(ts)
+    if m and m.group(1):
+        return ts
     try:
+        if m and _LOCAL_IS_UTC:
+            dt.datetime.fromisoformat(ts)  # still reject out-of-range fields
+            return f"{ts}Z"
         t = ts.replace("Z", "+00:00")
         d = dt.datetime.fromisoformat(t)
         return d.astimezone(dt.timezone.utc).isoformat().replace("+00:00", "Z")
@@ -64,162 +86,218 @@ def _fmt_ts(ts: Optional[str]) -> str:
 
 
 def _safe_json(obj: Any) -> str:
-    return redact_secrets(json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=True))
+    return redact_secrets(dumps_json(obj, sort_keys=True))
 
 
-def is_chat_message(event: Dict[str, Any]) -> bool:
-    if event.get("source") not in {"user", "agent"}:
-        return False
-    if event.get("action") != "message":
-        return False
-    return bool(_get_text(event).strip())
+_CHAT_KEYS = frozenset({("user", "message"), ("agent", "message")})
 
+# (source, action) pairs that are never worth showing:
+# - user recall events are internal plumbing (not user-authored messages),
+# - agent system prompt injection is rarely useful in a transcript,
+# - pure agent state toggles.
+_NOISE_ACTIONS = frozenset(
+    {("user", "recall"), ("agent", "system"), ("environment", "change_agent_state")}
+)
+# (source, observation) pairs: environment state-change events are usually
+# noisy and add little value.
+_NOISE_OBSERVATIONS = frozenset({("environment", "agent_state_changed")})
 
-def is_noise_event(event: Dict[str, Any]) -> bool:
-    src = event.get("source")
-    action = event.get("action")
-    obs = event.get("observation")
 
-    # Environment state-change events are usually noisy and add little value.
-    if src == "environment" and obs == "agent_state_changed":
-        return True
+def _is_chat(src: Any, action: Any, event: Dict[str, Any]) -> bool:
+    return (src, action) in _CHAT_KEYS and bool(_get_text(event).strip())
 
-    # User recall events are internal plumbing (not user-authored messages).
-    if src == "user" and action == "recall":
-        return True
 
-    # Agent system prompt injection is rarely useful in a transcript.
-    if src == "agent" and action == "system":
+def _is_noise(src: Any, action: Any, obs: Any, event: Dict[str, Any]) -> bool:
+    if (src, obs) in _NOISE_OBSERVATIONS or (src, action) in _NOISE_ACTIONS:
         return True
 
     # Misc empty environment observations.
-    if src == "environment" and (obs in {None, "null"}) and not _get_text(event).strip():
-        return True
+    return src == "environment" and (obs in {None, "null"}) and not _get_text(event).strip()
 
-    # Pure agent state toggles.
-    if src == "environment" and action == "change_agent_state":
-        return True
 
-    return False
+def is_chat_message(event: Dict[str, Any]) -> bool:
+    return _is_chat(event.get("source"), event.get("action"), event)
 
 
-def render_chat_message(event: Dict[str, Any]) -> str:
-    eid = event.get("id")
-    ts = _fmt_ts(event.get("timestamp"))
-    src = event.get("source")
-    role = "User" if src == "user" else "Assistant" if src == "agent" else str(src)
+def is_noise_event(event: Dict[str, Any]) -> bool:
+    return _is_noise(event.get("source"), event.get("action"), event.get("observation"), event)
 
-    header_bits = [role]
-    if ts:
-        header_bits.append(ts)
-    if isinstance(eid, int):
-        header_bits.append(f"id={eid}")
 
-    text = _get_text(event).strip()
-    return "\n".join([f"### {' · '.join(header_bits)}", "", text, ""])
+_CHAT_TPL = "### {header}\n\n{text}\n"
+_TOOL_CALL_TPL = "#### {header}\n\n```json\n{body}\n```\n"
+_TEXT_BLOCK_TPL = "\n\n```text\n{body}\n```"
+_JSON_BLOCK_TPL = "\n\n```json\n{body}\n```"
+_FALLBACK_TPL = "#### {header}" + _TEXT_BLOCK_TPL + "\n"
 
 
-def render_tool_event(event: Dict[str, Any], *, tool_call_by_id: Dict[int, Dict[str, Any]], head: int, tail: int) -> str:
-    eid = event.get("id")
+def _header(lead: str, event: Dict[str, Any]) -> str:
+    """`lead · <timestamp> · id=<id>`, leaving out whichever the event lacks."""
+    header = lead
     ts = _fmt_ts(event.get("timestamp"))
-    src = event.get("source") or "event"
-
-    header_bits: List[str] = [f"{src}"]
     if ts:
-        header_bits.append(ts)
+        header += f" · {ts}"
+    eid = event.get("id")
     if isinstance(eid, int):
-        header_bits.append(f"id={eid}")
-
-    if "action" in event and event.get("action") is not None:
-        action = event.get("action")
-        if isinstance(action, str):
-            header_bits.append(f"action={action}")
-
-        body: List[str] = []
-        body.append(f"#### {' · '.join(header_bits)}")
-        body.append("")
-        body.append("```json")
-        body.append(
-            _safe_json({k: event.get(k) for k in ("action", "args", "timeout") if k in event})
-        )
-        body.append("```")
-        body.append("")
-        return "\n".join(body)
-
-    if "observation" in event and event.get("observation") is not None:
-        obs = event.get("observation")
-        cause = event.get("cause")
-        if isinstance(obs, str):
-            header_bits.append(f"observation={obs}")
-        if isinstance(cause, int):
-            header_bits.append(f"cause={cause}")
-            cause_evt = tool_call_by_id.get(cause)
-            cause_action = (cause_evt or {}).get("action")
-            if isinstance(cause_action, str):
-                header_bits.append(f"cause_action={cause_action}")
-
-        content = _get_text(event)
-        content = _truncate(content, head=head, tail=tail) if content else ""
-
-        body = []
-        body.append(f"#### {' · '.join(header_bits)}")
-        if content:
-            body.append("")
-            body.append("```text")
-            body.append(content.rstrip())
-            body.append("```")
-
-        extras = event.get("extras")
-        if extras:
-            body.append("")
-            body.append("```json")
-            body.append(_safe_json(extras))
-            body.append("```")
-
-        body.append("")
-        return "\n".join(body)
+        header += f" · id={eid}"
+    return header
 
+
+def render_chat_message(event: Dict[str, Any]) -> str:
+    src = event.get("source")
+    role = "User" if src == "user" else "Assistant" if src == "agent" else str(src)
+    return _CHAT_TPL.format_map({"header": _header(role, event), "text": _get_text(event).strip()})
+
+
+_TOOL_CALL_KEYS = ("action", "args", "timeout")
+_MISSING = object()
+
+
+def _pick(d: Dict[str, Any], keys: Iterable[str]) -> Dict[str, Any]:
+    """The subset of `d` present in `keys` (one dict lookup per key)."""
+    out = {}
+    for k in keys:
+        v = d.get(k, _MISSING)
+        if v is not _MISSING:
+            out[k] = v
+    return out
+
+
+def _render_tool_call(event: Dict[str, Any], header: str, tool_action_by_id: Dict[int, Any], head: int, tail: int) -> str:
+    action = event["action"]
+    if isinstance(action, str):
+        header += f" · action={action}"
+    body = _safe_json(_pick(event, _TOOL_CALL_KEYS))
+    return _TOOL_CALL_TPL.format_map({"header": header, "body": body})
+
+
+def _render_observation(event: Dict[str, Any], header: str, tool_action_by_id: Dict[int, Any], head: int, tail: int) -> str:
+    obs = event["observation"]
+    cause = event.get("cause")
+    if isinstance(obs, str):
+        header += f" · observation={obs}"
+    if isinstance(cause, int):
+        header += f" · cause={cause}"
+        cause_action = tool_action_by_id.get(cause)
+        if isinstance(cause_action, str):
+            header += f" · cause_action={cause_action}"
+
+    out = f"#### {header}"
+    content = _get_text(event)
+    if content:
+        content = _truncate(content, head=head, tail=tail)
+    if content:
+        out += _TEXT_BLOCK_TPL.format_map({"body": content.rstrip()})
+    extras = event.get("extras")
+    if extras:
+        out += _JSON_BLOCK_TPL.format_map({"body": _safe_json(extras)})
+    return out + "\n"
+
+
+def _render_other(event: Dict[str, Any], header: str, tool_action_by_id: Dict[int, Any], head: int, tail: int) -> str:
     # Fallback: unknown event shape
     text = _get_text(event)
     if not text:
         return ""
     text = _truncate(text, head=head, tail=tail)
-    return "\n".join([f"#### {' · '.join(header_bits)}", "", "```text", text.rstrip(), "```", ""]) 
+    return _FALLBACK_TPL.format_map({"header": header, "body": text.rstrip()})
+
+
+_TOOL_RENDERERS = {
+    "tool_call": _render_tool_call,
+    "observation": _render_observation,
+    "other": _render_other,
+}
+
+
+def classify_tool_event(event: Dict[str, Any]) -> str:
+    if event.get("action") is not None:
+        return "tool_call"
+    if event.get("observation") is not None:
+        return "observation"
+    return "other"
+
+
+def render_tool_event(event: Dict[str, Any], *, tool_action_by_id: Dict[int, Any], head: int, tail: int) -> str:
+    renderer = _TOOL_RENDERERS[classify_tool_event(event)]
+    header = _header(f"{event.get('source') or 'event'}", event)
+    return renderer(event, header, tool_action_by_id, head, tail)
 
 
-def render_tools_block(events: List[Dict[str, Any]], *, tool_call_by_id: Dict[int, Dict[str, Any]], head: int, tail: int) -> str:
+def render_tools_block(events: List[Dict[str, Any]], *, tool_action_by_id: Dict[int, Any], head: int, tail: int) -> str:
     if not events:
         return ""
 
     lines: List[str] = []
     lines.append(f"<details>\n<summary>Tool calls / results ({len(events)} events)</summary>\n")
     for e in events:
-        chunk = render_tool_event(e, tool_call_by_id=tool_call_by_id, head=head, tail=tail)
+        chunk = render_tool_event(e, tool_action_by_id=tool_action_by_id, head=head, tail=tail)
         if chunk.strip():
             lines.append(chunk)
     lines.append("</details>\n")
     return "\n".join(lines)
 
 
-def render_markdown(payload: Dict[str, Any], *, head: int, tail: int) -> str:
+class _MarkdownWriter:
+    """Streams chunks to a file as if they were joined with "\n" and the
+    result rstripped, holding back only trailing whitespace."""
+
+    def __init__(self, f: TextIO) -> None:
+        self._f = f
+        self._held = ""
+        self._first = True
+
+    def append(self, chunk: str) -> None:
+        text = self._held + (chunk if self._first else "\n" + chunk)
+        self._first = False
+        kept = text.rstrip()
+        if kept:
+            self._f.write(kept)
+        self._held = text[len(kept):]
+
+    def close(self) -> None:
+        self._f.write("\n")
+
+
+_BAD_PAYLOAD = "Input JSON does not look like an export_conversation.py payload"
+
+
+class StreamedEvents:
+    """Re-iterable view of a payload file's "events" array, parsed lazily on each pass (needs ijson)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __iter__(self) -> Iterator[Any]:
+        with open(self.path, "rb") as f:
+            yield from json_io.ijson.items(f, "events.item", use_float=True)
+
+
+def render_markdown(
+    payload: Dict[str, Any], *, head: int, tail: int, out_file: Optional[TextIO] = None
+) -> Optional[str]:
+    """Render the transcript; written to `out_file` if given, else returned."""
     convo = payload.get("conversation") if isinstance(payload, dict) else None
     events = payload.get("events") if isinstance(payload, dict) else None
 
     if not isinstance(convo, dict) or not isinstance(events, list):
-        raise ValueError("Input JSON does not look like an export_conversation.py payload")
+        raise ValueError(_BAD_PAYLOAD)
 
-    title = convo.get("title") or convo.get("conversation_id") or "Conversation"
+    return render_transcript(convo, events, head=head, tail=tail, out_file=out_file)
 
-    tool_calls: Dict[int, Dict[str, Any]] = {}
-    for e in events:
-        if not isinstance(e, dict) or not isinstance(e.get("id"), int):
-            continue
-        action = e.get("action")
-        if action is None or action == "message":
-            continue
-        tool_calls[int(e["id"])] = e
 
-    out: List[str] = []
+def render_transcript(
+    convo: Dict[str, Any],
+    events: Iterable[Any],
+    *,
+    head: int,
+    tail: int,
+    out_file: Optional[TextIO] = None,
+) -> Optional[str]:
+    """Like render_markdown, but `events` may be any iterable (e.g. a StreamedEvents)."""
+    title = convo.get("title") or convo.get("conversation_id") or "Conversation"
+
+    buf = io.StringIO() if out_file is None else None
+    out = _MarkdownWriter(out_file or buf)
     out.append(f"# {title}\n")
     out.append("## Metadata\n")
     out.append(f"- Conversation ID: `{convo.get('conversation_id')}`")
@@ -237,6 +315,12 @@ def render_markdown(payload: Dict[str, Any], *, head: int, tail: int) -> str:
 
     out.append("## Transcript\n")
 
+    # Observations only need their cause's action name, so index just that
+    # rather than keeping every tool-call event alive. The index is filled in
+    # the same pass as rendering: a tool block is only rendered once the next
+    # chat message arrives, by which point every cause it references (always
+    # an earlier event) has been indexed.
+    tool_actions: Dict[int, Any] = {}
     preamble_tools: List[Dict[str, Any]] = []
     pending_tools: List[Dict[str, Any]] = []
     seen_first_message = False
@@ -244,20 +328,23 @@ def render_markdown(payload: Dict[str, Any], *, head: int, tail: int) -> str:
     for e in events:
         if not isinstance(e, dict):
             continue
-        if is_noise_event(e):
+        src, action, obs, eid = e.get("source"), e.get("action"), e.get("observation"), e.get("id")
+        if isinstance(eid, int) and action not in (None, "message"):
+            tool_actions[eid] = action
+        if _is_noise(src, action, obs, e):
             continue
 
-        if is_chat_message(e):
+        if _is_chat(src, action, e):
             if not seen_first_message:
                 tools_block = render_tools_block(
-                    preamble_tools, tool_call_by_id=tool_calls, head=head, tail=tail
+                    preamble_tools, tool_action_by_id=tool_actions, head=head, tail=tail
                 )
                 if tools_block.strip():
                     out.append(tools_block)
                 seen_first_message = True
             else:
                 tools_block = render_tools_block(
-                    pending_tools, tool_call_by_id=tool_calls, head=head, tail=tail
+                    pending_tools, tool_action_by_id=tool_actions, head=head, tail=tail
                 )
                 if tools_block.strip():
                     out.append(tools_block)
@@ -272,12 +359,13 @@ def render_markdown(payload: Dict[str, Any], *, head: int, tail: int) -> str:
             preamble_tools.append(e)
 
     tools_block = render_tools_block(
-        pending_tools, tool_call_by_id=tool_calls, head=head, tail=tail
+        pending_tools, tool_action_by_id=tool_actions, head=head, tail=tail
     )
     if tools_block.strip():
         out.append(tools_block)
 
-    return "\n".join(out).rstrip() + "\n"
+    out.close()
+    return buf.getvalue() if buf is not None else None
 
 
 def main() -> int:
@@ -298,14 +386,25 @@ def main() -> int:
     parser.add_argument("--tail", type=int, default=100)
     args = parser.parse_args()
 
-    with open(args.in_path, "r", encoding="utf-8") as f:
-        payload = json.load(f)
-
-    md = render_markdown(payload, head=args.head, tail=args.tail)
+    if json_io.should_stream(args.in_path):
+        # Stream events from disk; only the conversation details are held in memory.
+        convo, has_events = None, False
+        for key, value in json_io.stream_json_object(args.in_path, "events"):
+            if key == "conversation":
+                convo = value
+            elif key == "events":
+                has_events = isinstance(value, Iterator)
+            if convo is not None and has_events:
+                break
+        if not isinstance(convo, dict) or not has_events:
+            raise ValueError(_BAD_PAYLOAD)
+        render = partial(render_transcript, convo, StreamedEvents(args.in_path))
+    else:
+        render = partial(render_markdown, load_json(args.in_path))
 
     os.makedirs(os.path.dirname(os.path.abspath(args.out_path)), exist_ok=True)
-    with open(args.out_path, "w", encoding="utf-8") as f:
-        f.write(md)
+    with open(args.out_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        render(head=args.head, tail=args.tail, out_file=f)
 
     return 0
 
@@ -11,10 +11,11 @@ Truncation strategy:
 from __future__ import annotations
 
 import argparse
-import json
 import os
-from typing import Any
+from typing import Any, Iterator
 
+import json_io
+from json_io import dump_json, dumps_json, load_json
 from redaction import redact_secrets
 
 
@@ -44,19 +45,56 @@ def truncate_str(s: str, *, max_len: int, head: int, tail: int) -> str:
 
 
 def truncate_obj(obj: Any, *, max_len: int, head: int, tail: int) -> Any:
-    if isinstance(obj, str):
-        return truncate_str(obj, max_len=max_len, head=head, tail=tail)
-    if isinstance(obj, list):
-        return [truncate_obj(v, max_len=max_len, head=head, tail=tail) for v in obj]
-    if isinstance(obj, dict):
-        out: dict[str, Any] = {}
-        for k, v in obj.items():
-            if k in SENSITIVE_KEYS and isinstance(v, str) and v:
-                out[k] = "<redacted>"
+    # Iterative walk (explicit stack) so deeply nested payloads neither pay a
+    # Python call per node nor hit the recursion limit. Each stack entry fills
+    # one slot of an already-built parent container.
+    root: list[Any] = [None]
+    stack: list[tuple[Any, Any, Any]] = [(obj, root, 0)]
+    while stack:
+        node, parent, key = stack.pop()
+        if isinstance(node, str):
+            parent[key] = truncate_str(node, max_len=max_len, head=head, tail=tail)
+        elif isinstance(node, list):
+            new_list: list[Any] = [None] * len(node)
+            parent[key] = new_list
+            stack.extend((v, new_list, i) for i, v in enumerate(node))
+        elif isinstance(node, dict):
+            new_dict: dict[str, Any] = {}
+            parent[key] = new_dict
+            for k, v in node.items():
+                if k in SENSITIVE_KEYS and isinstance(v, str) and v:
+                    new_dict[k] = "<redacted>"
+                else:
+                    new_dict[k] = None  # placeholder keeps key order
+                    stack.append((v, new_dict, k))
+        else:
+            parent[key] = node
+    return root[0]
+
+
+def write_truncated_streaming(in_path: str, out_path: str, *, max_len: int, head: int, tail: int) -> None:
+    """truncate_obj + dump_json, but parsing/writing one event at a time (needs ijson).
+
+    Produces the same bytes as the in-memory path for an export payload.
+    """
+    members = json_io.stream_json_object(in_path, "events")
+    with open(out_path, "w", encoding="utf-8") as out:
+        sep = "{\n"
+        for key, value in members:
+            out.write(f"{sep}  {dumps_json(key)}: ")
+            sep = ",\n"
+            if not isinstance(value, Iterator):
+                value = truncate_obj({key: value}, max_len=max_len, head=head, tail=tail)[key]
+                out.write(dumps_json(value).replace("\n", "\n  "))
                 continue
-            out[k] = truncate_obj(v, max_len=max_len, head=head, tail=tail)
-        return out
-    return obj
+            item_sep = "[\n"
+            for item in value:
+                item = truncate_obj(item, max_len=max_len, head=head, tail=tail)
+                text = dumps_json(item).replace("\n", "\n    ")
+                out.write(f"{item_sep}    {text}")
+                item_sep = ",\n"
+            out.write("[]" if item_sep == "[\n" else "\n  ]")
+        out.write("{}" if sep == "{\n" else "\n}")
 
 
 def main() -> int:
@@ -78,14 +116,21 @@ def main() -> int:
     parser.add_argument("--tail", type=int, default=100)
     args = parser.parse_args()
 
-    with open(args.in_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out_path)), exist_ok=True)
+    if json_io.should_stream(args.in_path):
+        try:
+            write_truncated_streaming(
+                args.in_path, args.out_path, max_len=args.max_len, head=args.head, tail=args.tail
+            )
+            return 0
+        except ValueError:  # not an object at the top level; use the generic path
+            pass
+
+    data = load_json(args.in_path)
 
     truncated = truncate_obj(data, max_len=args.max_len, head=args.head, tail=args.tail)
 
-    os.makedirs(os.path.dirname(os.path.abspath(args.out_path)), exist_ok=True)
-    with open(args.out_path, "w", encoding="utf-8") as f:
-        json.dump(truncated, f, ensure_ascii=False, indent=2)
+    dump_json(truncated, args.out_path)
 
     return 0
 